@@ -3,17 +3,30 @@ Mirror management and testing functionality
 """
 
 import asyncio
+import json
+import math
+import os
+import ssl
 import time
-import urllib.request
-import concurrent.futures
-from typing import List, Tuple, Optional
+import unicodedata
+import aiohttp
+from operator import itemgetter
+from pathlib import Path
+from typing import List, Sequence, Tuple, Optional
 from utils.logging import get_logger
-from config.settings import MIRROR_TEST_TIMEOUT, MIRROR_TEST_SIZE, MAX_PARALLEL_MIRRORS
+from config.settings import (
+    MIRROR_TEST_TIMEOUT, MIRROR_TEST_SIZE, MAX_PARALLEL_MIRRORS,
+    MIRROR_SYNC_TIMEOUT, MIRROR_MAX_SYNC_AGE, MIRROR_RACE_TIMEOUT,
+    MIRROR_CACHE_FILE, MIRROR_CACHE_TTL
+)
 
 logger = get_logger(__name__)
 
-# Comprehensive worldwide mirror list
-WORLDWIDE_MIRRORS = [
+# One TLS context for every probe, so the CA bundle is parsed only once
+_SSL_CTX = ssl.create_default_context()
+
+# Comprehensive worldwide mirror list (immutable, shared by all callers)
+WORLDWIDE_MIRRORS = (
     # North America
     ('🇺🇸 Rackspace (Texas)', 'https://mirror.rackspace.com/archlinux/$repo/os/$arch'),
     ('🇺🇸 MIT (Massachusetts)', 'https://mirrors.mit.edu/archlinux/$repo/os/$arch'),
@@ -61,11 +74,99 @@ WORLDWIDE_MIRRORS = [
     # Global CDNs
     ('🌍 Worldwide CDN', 'https://geo.mirror.pkgbuild.com/$repo/os/$arch'),
     ('🌍 CloudFlare CDN', 'https://cloudflaremirrors.com/archlinux/$repo/os/$arch'),
-]
+)
+
+# Rough country centroids for the mirror locations above, keyed by ISO 3166 code
+COUNTRY_COORDINATES = {
+    'US': (39.8, -98.6), 'CA': (56.1, -106.3), 'BR': (-14.2, -51.9), 'CL': (-35.7, -71.5),
+    'DE': (51.2, 10.5), 'FR': (46.2, 2.2), 'GB': (55.4, -3.4), 'NL': (52.1, 5.3),
+    'SE': (60.1, 18.6), 'NO': (60.5, 8.5), 'CH': (46.8, 8.2), 'IT': (41.9, 12.6),
+    'ES': (40.5, -3.7), 'JP': (36.2, 138.3), 'KR': (35.9, 127.8), 'CN': (35.9, 104.2),
+    'SG': (1.35, 103.8), 'AU': (-25.3, 133.8), 'IN': (20.6, 79.0), 'ZA': (-30.6, 22.9),
+}
+
+# Timezone database shipped with tzdata, lists a reference coordinate per zone
+ZONE_TAB = Path('/usr/share/zoneinfo/zone.tab')
 
-def test_mirror_speed(mirror_data: Tuple[str, str], timeout: int = MIRROR_TEST_TIMEOUT) -> Tuple[str, str, Optional[int], Optional[str]]:
+def flag_to_country(name: str) -> Optional[str]:
+    """Extract the ISO country code from the flag emoji at the start of a mirror name"""
+    letters = []
+    for char in name:
+        char_name = unicodedata.name(char, '')
+        if not char_name.startswith('REGIONAL INDICATOR SYMBOL LETTER '):
+            break
+        letters.append(char_name[-1])
+    return ''.join(letters) if len(letters) == 2 else None
+
+def _parse_zone_coordinates(coordinates: str) -> Tuple[float, float]:
+    """Parse an ISO 6709 ±DDMM[SS]±DDDMM[SS] string from zone.tab"""
+    split = max(coordinates.rfind('+'), coordinates.rfind('-'))
+    
+    def to_degrees(value: str, degree_digits: int) -> float:
+        digits = value[1:]
+        degrees = int(digits[:degree_digits])
+        minutes = int(digits[degree_digits:degree_digits + 2])
+        seconds = int(digits[degree_digits + 2:] or 0)
+        sign = -1 if value[0] == '-' else 1
+        return sign * (degrees + minutes / 60 + seconds / 3600)
+    
+    return to_degrees(coordinates[:split], 2), to_degrees(coordinates[split:], 3)
+
+def get_timezone_coordinates(timezone: Optional[str] = None) -> Optional[Tuple[float, float]]:
     """
-    Test mirror speed by downloading a small file
+    Approximate the user's location from their timezone
+    Falls back to the /etc/localtime symlink when no timezone is given
+    """
+    if timezone is None:
+        try:
+            timezone = os.readlink('/etc/localtime').split('zoneinfo/', 1)[1]
+        except (OSError, IndexError):
+            return None
+    
+    try:
+        with open(ZONE_TAB, 'r') as f:
+            for line in f:
+                if line.startswith('#'):
+                    continue
+                fields = line.rstrip('\n').split('\t')
+                if len(fields) >= 3 and fields[2] == timezone:
+                    return _parse_zone_coordinates(fields[1])
+    except (OSError, ValueError) as e:
+        logger.debug(f"Could not read timezone coordinates: {e}")
+    
+    return None
+
+def _great_circle_km(origin: Tuple[float, float], target: Tuple[float, float]) -> float:
+    """Haversine distance between two (lat, lon) points"""
+    lat1, lon1, lat2, lon2 = map(math.radians, (*origin, *target))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 6371 * 2 * math.asin(math.sqrt(a))
+
+def sort_mirrors_by_distance(mirrors: Sequence[Tuple[str, str]], timezone: Optional[str] = None) -> List[Tuple[str, str]]:
+    """
+    Order mirrors nearest first so the likely winners are probed first
+    Keeps the original order when the user's location is unknown
+    """
+    origin = get_timezone_coordinates(timezone)
+    if origin is None:
+        return list(mirrors)
+    
+    def distance(mirror: Tuple[str, str]) -> float:
+        country = flag_to_country(mirror[0])
+        if country is None:
+            # Global CDNs route to a nearby edge anyway
+            return 0.0
+        coordinates = COUNTRY_COORDINATES.get(country)
+        if coordinates is None:
+            return math.inf
+        return _great_circle_km(origin, coordinates)
+    
+    return sorted(mirrors, key=distance)
+
+async def test_mirror_speed(session: aiohttp.ClientSession, mirror_data: Tuple[str, str], timeout: int = MIRROR_TEST_TIMEOUT) -> Tuple[str, str, Optional[int], Optional[str]]:
+    """
+    Test mirror speed by requesting only the first bytes of core.db
+    over a shared session, so the probe measures latency, not bandwidth
     Returns: (name, url, speed_ms, error_msg)
     """
     name, url = mirror_data
@@ -74,22 +175,19 @@ def test_mirror_speed(mirror_data: Tuple[str, str], timeout: int = MIRROR_TEST_T
         # Create test URL
         test_url = url.replace('$repo', 'core').replace('$arch', 'x86_64') + '/core.db'
         
-        # Create request with proper headers
-        request = urllib.request.Request(
-            test_url,
-            headers={
-                'User-Agent': 'GamerX-Installer/3.0 (Arch Linux)'
-            }
-        )
+        # Ask for a byte range so the mirror does not start streaming the whole db
+        headers = {'Range': f'bytes=0-{MIRROR_TEST_SIZE - 1}'}
         
         # Time the request
-        start_time = time.time()
+        start_time = time.perf_counter()
         
-        with urllib.request.urlopen(request, timeout=timeout) as response:
+        async with session.get(test_url, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+            # 206 when the range is honoured, 200 from mirrors that ignore it
+            response.raise_for_status()
             # Read limited amount of data
-            data = response.read(MIRROR_TEST_SIZE)
+            await response.content.read(MIRROR_TEST_SIZE)
             
-        end_time = time.time()
+        end_time = time.perf_counter()
         speed_ms = int((end_time - start_time) * 1000)
         
         logger.debug(f"Mirror {name}: {speed_ms}ms")
@@ -100,24 +198,93 @@ def test_mirror_speed(mirror_data: Tuple[str, str], timeout: int = MIRROR_TEST_T
         logger.debug(f"Mirror {name} failed: {error_msg}")
         return name, url, None, error_msg
 
-async def test_mirrors_parallel(mirrors: List[Tuple[str, str]], max_workers: int = MAX_PARALLEL_MIRRORS) -> List[Tuple[str, str, Optional[int], Optional[str]]]:
+async def check_mirror_sync(session: aiohttp.ClientSession, mirror_data: Tuple[str, str], timeout: int = MIRROR_SYNC_TIMEOUT) -> Optional[str]:
     """
-    Test mirrors in parallel using ThreadPoolExecutor
-    Returns list of (name, url, speed_ms, error_msg) tuples
+    Check the mirror's lastsync timestamp before spending a speed test on it
+    Returns an error message for unreachable or stale mirrors, None otherwise
     """
-    logger.info(f"Testing {len(mirrors)} mirrors with {max_workers} parallel workers...")
+    name, url = mirror_data
+    
+    # lastsync lives at the mirror root, next to the $repo directories
+    lastsync_url = url.split('/$repo', 1)[0] + '/lastsync'
+    
+    try:
+        async with session.get(lastsync_url, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+            if response.status != 200:
+                # Not every mirror publishes lastsync, let the speed test decide
+                return None
+            last_sync = int((await response.text()).strip())
+    except ValueError:
+        return None
+    except Exception as e:
+        error_msg = str(e)[:50] + "..." if len(str(e)) > 50 else str(e)
+        logger.debug(f"Mirror {name} unreachable: {error_msg}")
+        return error_msg or "Unreachable"
     
-    loop = asyncio.get_event_loop()
+    age = time.time() - last_sync
+    if age > MIRROR_MAX_SYNC_AGE:
+        age_hours = int(age // 3600)
+        logger.debug(f"Mirror {name} is stale: last synced {age_hours}h ago")
+        return f"Out of date ({age_hours}h)"
+    
+    return None
+
+async def probe_mirror(session: aiohttp.ClientSession, mirror_data: Tuple[str, str],
+                       limiter: Optional[asyncio.Semaphore] = None) -> Tuple[str, str, Optional[int], Optional[str]]:
+    """
+    Speed test a mirror only if its lastsync check passes
+    The limiter is held for the whole probe so time spent queueing for a
+    free slot never counts against the probe's own timeouts or its speed;
+    it does count against the overall race in get_fastest_mirrors
+    Returns: (name, url, speed_ms, error_msg)
+    """
+    if limiter is None:
+        limiter = asyncio.Semaphore(1)
     
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all mirror tests
-        futures = [
-            loop.run_in_executor(executor, test_mirror_speed, mirror)
-            for mirror in mirrors
-        ]
+    async with limiter:
+        sync_error = await check_mirror_sync(session, mirror_data)
+        if sync_error:
+            name, url = mirror_data
+            return name, url, None, sync_error
         
-        # Wait for all tests to complete
-        results = await asyncio.gather(*futures)
+        return await test_mirror_speed(session, mirror_data)
+
+def create_mirror_session(max_connections: int = MAX_PARALLEL_MIRRORS) -> aiohttp.ClientSession:
+    """
+    Create an HTTP session whose connector pools connections, caches DNS
+    results and shares one TLS context across all mirror hosts
+    """
+    connector = aiohttp.TCPConnector(
+        limit=max_connections,
+        ssl=_SSL_CTX,
+        ttl_dns_cache=300,
+        force_close=False
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        headers={'User-Agent': 'GamerX-Installer/3.0 (Arch Linux)'}
+    )
+
+async def test_mirrors_parallel(mirrors: List[Tuple[str, str]], max_workers: int = MAX_PARALLEL_MIRRORS,
+                                session: Optional[aiohttp.ClientSession] = None) -> List[Tuple[str, str, Optional[int], Optional[str]]]:
+    """
+    Test mirrors concurrently on the event loop, no worker threads involved
+    At most max_workers probes are in flight at once
+    Returns list of (name, url, speed_ms, error_msg) tuples
+    """
+    logger.info(f"Testing {len(mirrors)} mirrors with {max_workers} parallel connections...")
+    
+    if session is None:
+        async with create_mirror_session(max_workers) as own_session:
+            return await test_mirrors_parallel(mirrors, max_workers, own_session)
+    
+    limiter = asyncio.Semaphore(max_workers)
+    
+    # Stale or unreachable mirrors are dropped by the cheap lastsync check
+    results = await asyncio.gather(*[
+        probe_mirror(session, mirror, limiter)
+        for mirror in mirrors
+    ])
     
     logger.info(f"Mirror testing completed: {len(results)} results")
     return results
@@ -132,17 +299,19 @@ def sort_mirrors_by_speed(results: List[Tuple[str, str, Optional[int], Optional[
     
     for name, url, speed_ms, error_msg in results:
         if speed_ms is not None:
-            display_name = f"{name} ({speed_ms}ms)"
-            working_mirrors.append((display_name, url, "working"))
+            working_mirrors.append((speed_ms, name, url))
         else:
             display_name = f"{name} (Failed: {error_msg})"
             failed_mirrors.append((display_name, url, "failed"))
     
-    # Sort working mirrors by speed
-    working_mirrors.sort(key=lambda x: int(x[0].split('(')[1].split('ms')[0]))
+    # Sort working mirrors by speed, formatting only after sorting
+    working_mirrors.sort(key=itemgetter(0))
     
     # Combine working + failed mirrors
-    return working_mirrors + failed_mirrors
+    return [
+        (f"{name} ({speed_ms}ms)", url, "working")
+        for speed_ms, name, url in working_mirrors
+    ] + failed_mirrors
 
 async def get_tested_mirrors() -> List[Tuple[str, str, str]]:
     """
@@ -151,8 +320,9 @@ async def get_tested_mirrors() -> List[Tuple[str, str, str]]:
     """
     logger.info("Starting comprehensive mirror testing...")
     
-    # Test all mirrors in parallel
-    results = await test_mirrors_parallel(WORLDWIDE_MIRRORS)
+    # Test all mirrors in parallel over one pooled session
+    async with create_mirror_session() as session:
+        results = await test_mirrors_parallel(WORLDWIDE_MIRRORS, session=session)
     
     # Sort by speed
     sorted_mirrors = sort_mirrors_by_speed(results)
@@ -161,6 +331,43 @@ async def get_tested_mirrors() -> List[Tuple[str, str, str]]:
     
     return sorted_mirrors
 
+async def get_fastest_mirrors(k: int = 5, mirrors: Sequence[Tuple[str, str]] = WORLDWIDE_MIRRORS, timezone: Optional[str] = None) -> List[Tuple[str, str, str]]:
+    """
+    Race all mirrors and return as soon as k of them have answered
+    Mirrors are probed nearest first, so the race usually ends on the first wave
+    Outstanding probes are cancelled instead of waiting for their timeouts
+    Returns list of (display_name, url, status) tuples, fastest first
+    """
+    mirrors = sort_mirrors_by_distance(mirrors, timezone)
+    logger.info(f"Racing {len(mirrors)} mirrors for the fastest {k}...")
+    
+    results = []
+    
+    async with create_mirror_session() as session:
+        limiter = asyncio.Semaphore(MAX_PARALLEL_MIRRORS)
+        tasks = [asyncio.create_task(probe_mirror(session, mirror, limiter)) for mirror in mirrors]
+        
+        try:
+            # Each probe may spend MIRROR_SYNC_TIMEOUT on lastsync before its speed
+            # test starts, so the race allows for both; probes still queued on the
+            # limiter when it ends are cancelled with the rest
+            for next_result in asyncio.as_completed(tasks, timeout=MIRROR_RACE_TIMEOUT):
+                result = await next_result
+                if result[2] is not None:
+                    results.append(result)
+                    if len(results) >= k:
+                        break
+        except asyncio.TimeoutError:
+            logger.debug(f"Mirror race timed out with {len(results)} responders")
+        finally:
+            # Cancel the stragglers and let them unwind before the session closes
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    logger.info(f"Mirror race complete: {len(results)} fast mirrors")
+    return sort_mirrors_by_speed(results)
+
 def get_fastest_mirror(mirrors: List[Tuple[str, str, str]]) -> Optional[Tuple[str, str]]:
     """Get the fastest working mirror"""
     for display_name, url, status in mirrors:
@@ -168,25 +375,77 @@ def get_fastest_mirror(mirrors: List[Tuple[str, str, str]]) -> Optional[Tuple[st
             return display_name, url
     return None
 
+async def race_fastest_mirror(mirrors: Sequence[Tuple[str, str]] = WORLDWIDE_MIRRORS, timezone: Optional[str] = None) -> Optional[Tuple[str, str]]:
+    """Race the mirrors and get the first one to answer the speed probe"""
+    return get_fastest_mirror(await get_fastest_mirrors(k=1, mirrors=mirrors, timezone=timezone))
+
 # Cache for mirror test results
 _mirror_cache = None
 _cache_timestamp = 0
 
-async def get_cached_mirrors(cache_duration: int = 300) -> List[Tuple[str, str, str]]:
+def _load_mirror_cache(cache_duration: int) -> Optional[Tuple[float, List[Tuple[str, str, str]]]]:
+    """
+    Load mirror results saved by a previous run if they are still fresh
+    Returns: (age_seconds, mirrors)
+    """
+    try:
+        with open(MIRROR_CACHE_FILE, 'r') as f:
+            data = json.load(f)
+        
+        # The file outlives this process, so its timestamp is wall-clock time
+        age = time.time() - data['timestamp']
+        if not 0 <= age < cache_duration:
+            return None
+        
+        return age, [tuple(mirror) for mirror in data['mirrors']]
+        
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+def _save_mirror_cache(mirrors: List[Tuple[str, str, str]], timestamp: float):
+    """Persist working mirrors so the next run can skip testing"""
+    try:
+        MIRROR_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = MIRROR_CACHE_FILE.with_suffix('.tmp')
+        
+        # Only keep working mirrors so a transient outage does not stick
+        with open(tmp_file, 'w') as f:
+            json.dump({
+                'timestamp': timestamp,
+                'mirrors': [m for m in mirrors if m[2] == "working"]
+            }, f)
+        
+        os.replace(tmp_file, MIRROR_CACHE_FILE)
+        
+    except OSError as e:
+        logger.warning(f"Could not save mirror cache: {e}")
+
+async def get_cached_mirrors(cache_duration: int = MIRROR_CACHE_TTL) -> List[Tuple[str, str, str]]:
     """
-    Get mirrors with caching (5 minute default cache)
+    Get mirrors with caching (1 hour default cache)
+    Results are kept in memory and on disk so repeat runs skip testing
     """
     global _mirror_cache, _cache_timestamp
     
-    current_time = time.time()
+    # Monotonic so clock jumps cannot keep stale results alive
+    current_time = time.monotonic()
     
     # Return cached results if still valid
     if _mirror_cache and (current_time - _cache_timestamp) < cache_duration:
         logger.info("Using cached mirror results")
         return _mirror_cache
     
+    # Fall back to results saved by a previous run
+    disk_cache = _load_mirror_cache(cache_duration)
+    if disk_cache and disk_cache[1]:
+        logger.info(f"Using mirror results cached in {MIRROR_CACHE_FILE}")
+        age, _mirror_cache = disk_cache
+        _cache_timestamp = current_time - age
+        return _mirror_cache
+    
     # Test mirrors and cache results
     _mirror_cache = await get_tested_mirrors()
     _cache_timestamp = current_time
+    _save_mirror_cache(_mirror_cache, time.time())
     
     return _mirror_cache
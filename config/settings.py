@@ -3,7 +3,10 @@ Global settings and configuration for GamerX Installer
 """
 
 import os
+import re
+from dataclasses import dataclass, field, replace
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
 # Application info
 APP_NAME = "GamerX Installer"
@@ -27,6 +30,14 @@ DEFAULT_MIRROR = "https://geo.mirror.pkgbuild.com/$repo/os/$arch"
 MIRROR_TEST_TIMEOUT = 3
 MIRROR_TEST_SIZE = 2048  # 2KB test download
 MAX_PARALLEL_MIRRORS = 20
+MIRROR_SYNC_TIMEOUT = 1
+MIRROR_RACE_TIMEOUT = MIRROR_SYNC_TIMEOUT + MIRROR_TEST_TIMEOUT  # A full probe: lastsync check then speed test
+MIRROR_MAX_SYNC_AGE = 24 * 3600  # Mirrors older than a day are skipped
+MIRROR_CACHE_FILE = LOGS_DIR / "mirror_cache.json"
+MIRROR_CACHE_TTL = 3600  # 1 hour, mirror rankings change slowly
+PACMAN_CONF = Path("/etc/pacman.conf")
+PARALLEL_DOWNLOADS = 10
+PREFETCH_PARALLEL = 16  # Concurrent curl transfers when prefetching packages
 
 # UI settings
 THEME_COLORS = {
@@ -46,43 +57,89 @@ THEME_COLORS = {
 }
 
 # Installation configuration state
-CONFIG = {
+@dataclass(slots=True)
+class InstallerConfig:
+    """
+    Installer choices collected by the UI screens
+    Fields are read as attributes; the mapping methods keep
+    config["key"] style call sites working
+    """
     # Disk configuration
-    "disk": None,
-    "filesystem": "ext4",
-    "swap_size": "2G",
+    disk: Optional[str] = None
+    filesystem: str = "ext4"
+    swap_size: Any = "2G"
     
     # User configuration
-    "hostname": "",
-    "username": "",
-    "password": "",
-    "sudo_enabled": True,
+    hostname: str = ""
+    username: str = ""
+    password: str = ""
+    root_password: str = ""
+    sudo_enabled: bool = True
     
     # System configuration
-    "language": ("en_US.UTF-8", "🇺🇸 English (United States)"),
-    "locale": ("en_US.UTF-8", "🇺🇸 English (United States)"),
-    "timezone": "UTC",
-    "kernel": "linux",
+    language: Tuple[str, str] = ("en_US.UTF-8", "🇺🇸 English (United States)")
+    locale: Any = ("en_US.UTF-8", "🇺🇸 English (United States)")
+    timezone: str = "UTC"
+    kernel: str = "linux"
     
     # Network configuration
-    "mirror": None,
-    "mirror_list": [],
+    mirror: Optional[str] = None
+    mirror_url: Optional[str] = None
+    mirror_country: Optional[str] = None
+    mirror_list: List[str] = field(default_factory=list)
     
     # Installation options
-    "profile": "Hyprland",
-    "additional_packages": "",
+    profile: str = "Hyprland"
+    profiles: List[str] = field(default_factory=list)
+    additional_packages: Any = ""
+    custom_configs: Dict[str, Any] = field(default_factory=dict)
     
     # Advanced options
-    "enable_multilib": True,
-    "install_yay": True,
-    "install_hyde": True,
-}
+    enable_multilib: bool = True
+    install_yay: bool = True
+    install_hyde: bool = True
+    
+    # Set on the shared CONFIG defaults, which are only ever copied
+    _read_only: bool = field(default=False, repr=False, compare=False)
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        if getattr(self, "_read_only", False):
+            raise AttributeError(f"{type(self).__name__} defaults are read-only, write to a copy()")
+        object.__setattr__(self, name, value)
+    
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+    
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key not in self.__dataclass_fields__:
+            raise KeyError(key)
+        setattr(self, key, value)
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self.__dataclass_fields__
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+    
+    def copy(self) -> "InstallerConfig":
+        # List and dict fields are copied too, so appending to a copy's
+        # profiles or custom_configs never reaches the read-only defaults
+        return replace(self, _read_only=False, **{
+            name: value.copy() for name in self.__dataclass_fields__
+            if isinstance(value := getattr(self, name), (list, dict))
+        })
+
+CONFIG = InstallerConfig(_read_only=True)
 
-# Validation patterns
+# Validation patterns, compiled once at import
 VALIDATION = {
-    "hostname": r"^[a-zA-Z0-9][a-zA-Z0-9-]{0,62}[a-zA-Z0-9]?$",
-    "username": r"^[a-z_][a-z0-9_-]{0,31}$",
-    "package_name": r"^[a-z0-9][a-z0-9+._-]*$"
+    # 2-63 letters, digits and hyphens, no hyphen at either end and no "--"
+    "hostname": re.compile(r"^(?!-)(?!.*--)[A-Za-z0-9-]{2,63}(?<!-)$"),
+    "username": re.compile(r"^[a-z_][a-z0-9_-]{0,31}$"),
+    "package_name": re.compile(r"^[a-z0-9][a-z0-9+._-]*$")
 }
 
 # Available options
@@ -4,15 +4,58 @@ Enhanced version of gx_disk.py with better error handling and space validation
 """
 
 import subprocess
-import glob
+import concurrent.futures
+import json
+import re
 import shutil
+import time
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 from utils.logging import get_logger
+from utils.validation import get_total_ram_gb, format_size
 from config.settings import MOUNT_POINT, FILESYSTEMS
 
 logger = get_logger(__name__)
 
+# Wipe, partition and re-read the table in one process; $1 is the disk path
+PARTITION_SCRIPT = (
+    'set -e; '
+    'wipefs -a "$1"; '
+    'sgdisk -Z "$1"; '
+    'sgdisk -n 1:0:+512M -t 1:ef00 -n 2:0:0 -t 2:8300 "$1"; '
+    'partprobe "$1"'
+)
+
+# Root filesystem format commands, the partition path is appended
+MKFS_COMMANDS = {
+    "ext4": ['mkfs.ext4', '-F'],
+    "btrfs": ['mkfs.btrfs', '-f'],
+    "xfs": ['mkfs.xfs', '-f'],
+    "f2fs": ['mkfs.f2fs', '-f'],
+}
+
+SYS_BLOCK = Path("/sys/block")
+OCTAL_ESCAPE = re.compile(r'\\([0-7]{3})')
+
+def read_mountinfo() -> List[Tuple[str, str]]:
+    """Read current mounts from /proc/self/mountinfo as (source, target) pairs"""
+    mounts = []
+    with open('/proc/self/mountinfo', 'r') as f:
+        for line in f:
+            fields, _, fs_fields = line.partition(' - ')
+            target = fields.split()[4]
+            source = fs_fields.split()[1]
+            # mountinfo escapes spaces and other specials as octal (\040)
+            mounts.append((source, OCTAL_ESCAPE.sub(lambda m: chr(int(m.group(1), 8)), target)))
+    return mounts
+
+def read_swaps() -> List[str]:
+    """Read the active swap devices and files from /proc/swaps"""
+    with open('/proc/swaps', 'r') as f:
+        # First line is the column header; paths use the same octal escapes as mountinfo
+        return [OCTAL_ESCAPE.sub(lambda m: chr(int(m.group(1), 8)), line.split()[0])
+                for line in f.readlines()[1:] if line.strip()]
+
 class DiskError(Exception):
     """Custom disk operation error"""
     pass
@@ -20,43 +63,61 @@ class DiskError(Exception):
 class DiskManager:
     """Intelligent disk management with logical validation"""
     
+    # How long an lsblk snapshot stays valid before it is re-read
+    SNAPSHOT_TTL = 2.0
+    
     def __init__(self):
         self.mount_point = MOUNT_POINT
+        self._snapshot: Optional[Dict[str, Dict]] = None
+        self._snapshot_time = 0.0
+    
+    def _load_lsblk_snapshot(self, force: bool = False) -> Dict[str, Dict]:
+        """Get all block devices from a single lsblk JSON dump, keyed by name"""
+        now = time.monotonic()
+        if not force and self._snapshot is not None and now - self._snapshot_time < self.SNAPSHOT_TTL:
+            return self._snapshot
+        
+        result = subprocess.run([
+            'lsblk', '-J', '-b', '-d', '-o', 'NAME,SIZE,MODEL,TYPE'
+        ], capture_output=True, text=True, check=True)
         
-    def list_disks(self) -> List[Dict[str, str]]:
-        """List available disks with size and model info"""
+        self._snapshot = {
+            device['name']: device
+            for device in json.loads(result.stdout).get('blockdevices', [])
+        }
+        self._snapshot_time = now
+        return self._snapshot
+    
+    def list_disks(self, force: bool = False) -> List[Dict[str, str]]:
+        """List available disks with size and model info; force=True skips the cached lsblk snapshot"""
         disks = []
         
         try:
-            # Get disk info using lsblk
-            result = subprocess.run([
-                'lsblk', '-d', '-n', '-o', 'NAME,SIZE,MODEL,TYPE'
-            ], capture_output=True, text=True, check=True)
-            
-            for line in result.stdout.strip().split('\n'):
-                if not line.strip():
+            for name, device in self._load_lsblk_snapshot(force).items():
+                if device.get('type') != 'disk':
                     continue
-                    
-                parts = line.split(None, 3)
-                if len(parts) >= 3 and parts[3] == 'disk':
-                    name = parts[0]
-                    size = parts[1]
-                    model = parts[2] if len(parts) > 2 else "Unknown"
-                    
-                    # Full device path
-                    device_path = f"/dev/{name}"
-                    
-                    # Check if disk exists
-                    if Path(device_path).exists():
-                        disks.append({
-                            'name': name,
-                            'path': device_path,
-                            'size': size,
-                            'model': model,
-                            'display': f"💾 {name} ({size}) - {model}"
-                        })
+                
+                size_bytes = int(device.get('size') or 0)
+                size = format_size(size_bytes)
+                model = (device.get('model') or "Unknown").strip()
+                
+                # Full device path
+                device_path = f"/dev/{name}"
+                
+                # Check if disk exists
+                if Path(device_path).exists():
+                    disks.append({
+                        'name': name,
+                        'path': device_path,
+                        'device': device_path,
+                        'type': device['type'],
+                        'size': size,
+                        'size_bytes': size_bytes,
+                        'model': model,
+                        'display': f"💾 {name} ({size}) - {model}"
+                    })
                         
-        except subprocess.CalledProcessError as e:
+        except (subprocess.CalledProcessError, ValueError) as e:
             logger.error(f"Failed to list disks: {e}")
             raise DiskError(f"Could not list disks: {e}")
         
@@ -67,30 +128,46 @@ class DiskManager:
         return disks
     
     def get_disk_info(self, disk_path: str) -> Dict[str, str]:
-        """Get detailed disk information"""
+        """Get detailed disk information straight from sysfs, without forking lsblk"""
         try:
-            # Get disk size in bytes
-            result = subprocess.run([
-                'lsblk', '-b', '-d', '-n', '-o', 'SIZE,MODEL,FSTYPE', disk_path
-            ], capture_output=True, text=True, check=True)
+            name = Path(disk_path).name
+            sys_dir = SYS_BLOCK / name
             
-            parts = result.stdout.strip().split(None, 2)
-            size_bytes = int(parts[0])
+            # sysfs always reports size in 512-byte sectors
+            size_bytes = int((sys_dir / "size").read_text()) * 512
             size_gb = size_bytes // (1024**3)
-            model = parts[1] if len(parts) > 1 else "Unknown"
             
-            # Check if disk is currently mounted
-            mount_result = subprocess.run([
-                'lsblk', '-n', '-o', 'MOUNTPOINT', disk_path
-            ], capture_output=True, text=True)
-            
-            is_mounted = bool(mount_result.stdout.strip())
+            try:
+                model = (sys_dir / "device" / "model").read_text().strip() or "Unknown"
+            except OSError:
+                model = "Unknown"
+            
+            # Partitions appear as sysfs subdirectories named after the disk
+            children = [
+                {
+                    'name': part.name,
+                    'size': format_size(int((part / "size").read_text()) * 512)
+                }
+                for part in sorted(sys_dir.glob(f"{name}*"))
+            ]
+            
+            # Check if disk or any of its partitions is currently mounted or used as swap,
+            # or is held by a device-mapper/md device (LVM, LUKS, RAID) whose own
+            # mounts show up under /dev/mapper rather than under the disk
+            devices = {disk_path} | {f"/dev/{child['name']}" for child in children}
+            holder_dirs = [sys_dir / "holders"] + [sys_dir / child['name'] / "holders" for child in children]
+            is_mounted = (
+                any(source in devices for source, _ in read_mountinfo())
+                or any(source in devices for source in read_swaps())
+                or any(holders.is_dir() and any(holders.iterdir()) for holders in holder_dirs)
+            )
             
             return {
                 'path': disk_path,
                 'size_bytes': size_bytes,
                 'size_gb': size_gb,
                 'model': model,
+                'children': children,
                 'is_mounted': is_mounted,
                 'suitable': size_gb >= 20  # Minimum 20GB
             }
@@ -118,14 +195,8 @@ class DiskManager:
                 if swap_size == "auto":
                     # Auto = RAM size, max 8GB
                     try:
-                        with open('/proc/meminfo', 'r') as f:
-                            for line in f:
-                                if line.startswith('MemTotal:'):
-                                    ram_kb = int(line.split()[1])
-                                    ram_gb = ram_kb // (1024 * 1024)
-                                    swap_gb = min(ram_gb, 8)
-                                    break
-                    except:
+                        swap_gb = min(get_total_ram_gb(), 8)
+                    except (OSError, ValueError):
                         swap_gb = 2  # Default fallback
                 elif swap_size.endswith('G'):
                     swap_gb = int(swap_size[:-1])
@@ -165,24 +236,12 @@ class DiskManager:
             # Unmount any existing partitions
             self._unmount_disk(disk_path)
             
-            # Wipe disk
-            logger.info("Wiping disk...")
-            subprocess.run(['wipefs', '-a', disk_path], check=True, capture_output=True)
-            subprocess.run(['sgdisk', '-Z', disk_path], check=True, capture_output=True)
-            
-            # Create partitions
-            logger.info("Creating partitions...")
-            # EFI System Partition (512MB)
-            subprocess.run(['sgdisk', '-n', '1:0:+512M', '-t', '1:ef00', disk_path], 
+            # Wipe disk and create partitions in a single shell pipeline:
+            # EFI System Partition (512MB) + root partition (remaining space)
+            logger.info("Wiping disk and creating partitions...")
+            subprocess.run(['sh', '-c', PARTITION_SCRIPT, 'sh', disk_path],
                          check=True, capture_output=True)
             
-            # Root partition (remaining space)
-            subprocess.run(['sgdisk', '-n', '2:0:0', '-t', '2:8300', disk_path], 
-                         check=True, capture_output=True)
-            
-            # Wait for partition creation
-            subprocess.run(['partprobe', disk_path], check=True, capture_output=True)
-            
             # Determine partition names
             if 'nvme' in disk_path:
                 boot_part = f"{disk_path}p1"
@@ -191,34 +250,35 @@ class DiskManager:
                 boot_part = f"{disk_path}1"
                 root_part = f"{disk_path}2"
             
-            # Format partitions
-            logger.info("Formatting partitions...")
-            # Format EFI partition
-            subprocess.run(['mkfs.fat', '-F32', boot_part], check=True, capture_output=True)
-            
-            # Format root partition based on filesystem choice
-            if filesystem == "ext4":
-                subprocess.run(['mkfs.ext4', '-F', root_part], check=True, capture_output=True)
-            elif filesystem == "btrfs":
-                subprocess.run(['mkfs.btrfs', '-f', root_part], check=True, capture_output=True)
-            elif filesystem == "xfs":
-                subprocess.run(['mkfs.xfs', '-f', root_part], check=True, capture_output=True)
-            elif filesystem == "f2fs":
-                subprocess.run(['mkfs.f2fs', '-f', root_part], check=True, capture_output=True)
-            
-            # Mount partitions
-            logger.info("Mounting partitions...")
-            self.mount_point.mkdir(exist_ok=True)
-            subprocess.run(['mount', root_part, str(self.mount_point)], check=True, capture_output=True)
-            
-            boot_mount = self.mount_point / "boot" / "efi"
-            boot_mount.mkdir(parents=True, exist_ok=True)
-            subprocess.run(['mount', boot_part, str(boot_mount)], check=True, capture_output=True)
-            
-            # Create swap file if requested
-            swap_info = "No swap"
-            if swap_size != "none":
-                swap_info = self._create_swap_file(swap_size)
+            with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+                # Format partitions; the two mkfs runs touch different
+                # partitions, so the EFI one runs alongside the root one
+                logger.info("Formatting partitions...")
+                boot_format = executor.submit(
+                    subprocess.run, ['mkfs.fat', '-F32', boot_part], check=True, capture_output=True
+                )
+                
+                # Format root partition based on filesystem choice
+                subprocess.run(MKFS_COMMANDS[filesystem] + [root_part], check=True, capture_output=True)
+                boot_format.result()
+                
+                # Mount partitions; /boot/efi lives on the root filesystem,
+                # so root has to be mounted first
+                logger.info("Mounting partitions...")
+                self.mount_point.mkdir(exist_ok=True)
+                subprocess.run(['mount', root_part, str(self.mount_point)], check=True, capture_output=True)
+                
+                boot_mount = self.mount_point / "boot" / "efi"
+                boot_mount.mkdir(parents=True, exist_ok=True)
+                boot_mounted = executor.submit(
+                    subprocess.run, ['mount', boot_part, str(boot_mount)], check=True, capture_output=True
+                )
+                
+                # Create swap file if requested, while the EFI partition mounts
+                swap_info = "No swap"
+                if swap_size != "none":
+                    swap_info = self._create_swap_file(swap_size, filesystem)
+                boot_mounted.result()
             
             result = {
                 'status': 'success',
@@ -249,43 +309,39 @@ class DiskManager:
     def _unmount_disk(self, disk_path: str):
         """Safely unmount all partitions on a disk"""
         try:
-            # Find all partitions on the disk
-            if 'nvme' in disk_path:
-                partitions = glob.glob(f"{disk_path}p*")
-            else:
-                partitions = glob.glob(f"{disk_path}*")
-            
-            # Remove the base disk path
-            partitions = [p for p in partitions if p != disk_path]
-            
-            # Unmount each partition
-            for partition in partitions:
-                try:
-                    subprocess.run(['umount', partition], check=False, capture_output=True)
-                except:
-                    pass  # Ignore unmount errors
+            # Ask lsblk for the disk and its partitions; the first line is the disk itself
+            result = subprocess.run(
+                ['lsblk', '-nlpo', 'NAME', disk_path],
+                capture_output=True, text=True, check=True
+            )
+            partitions = result.stdout.split()[1:]
+            
+            # Unmount every partition in one call, ignoring ones that are not mounted
+            if partitions:
+                subprocess.run(['umount', '-q'] + partitions, check=False, capture_output=True)
                     
         except Exception as e:
             logger.warning(f"Error unmounting disk partitions: {e}")
     
-    def _create_swap_file(self, swap_size: str) -> str:
+    def _create_swap_file(self, swap_size: str, filesystem: str = "ext4") -> str:
         """Create and activate swap file with intelligent sizing"""
         try:
             # Calculate swap size
             if swap_size == "auto":
                 # Auto = RAM size, max 8GB
-                with open('/proc/meminfo', 'r') as f:
-                    for line in f:
-                        if line.startswith('MemTotal:'):
-                            ram_kb = int(line.split()[1])
-                            ram_gb = ram_kb // (1024 * 1024)
-                            swap_size = f"{min(ram_gb, 8)}G"
-                            break
+                swap_size = f"{min(get_total_ram_gb(), 8)}G"
             
             swap_file = self.mount_point / "swapfile"
             
             logger.info(f"Creating {swap_size} swap file...")
             
+            if filesystem == "btrfs":
+                # Swap on btrfs needs a NOCOW file; mkswapfile creates it with
+                # extents preallocated and runs mkswap in the same step
+                subprocess.run(['btrfs', 'filesystem', 'mkswapfile', '--size', swap_size, str(swap_file)],
+                             check=True, capture_output=True)
+                return f"Swap file created: {swap_size}"
+            
             # Create swap file
             subprocess.run(['fallocate', '-l', swap_size, str(swap_file)], 
                          check=True, capture_output=True)
@@ -304,6 +360,22 @@ class DiskManager:
             logger.error(f"Failed to create swap file: {e}")
             return f"Swap file creation failed: {e}"
     
+    def remove_swap_file(self) -> bool:
+        """Deactivate and delete the swap file created by auto_partition"""
+        swap_file = self.mount_point / "swapfile"
+        if not swap_file.exists():
+            return False
+        
+        subprocess.run(['swapoff', str(swap_file)], check=False, capture_output=True)
+        swap_file.unlink()
+        logger.info(f"Removed swap file: {swap_file}")
+        return True
+    
+    def unmount(self, path: Path) -> bool:
+        """Unmount a single mount point, returning whether it was mounted"""
+        result = subprocess.run(['umount', '-q', str(path)], check=False, capture_output=True)
+        return result.returncode == 0
+    
     def _cleanup_mounts(self):
         """Clean up mounts on error"""
         try:
@@ -319,9 +391,10 @@ class DiskManager:
             logger.warning(f"Cleanup error: {e}")
     
     def get_mount_status(self) -> Dict[str, bool]:
-        """Check current mount status"""
+        """Check current mount status from a single mountinfo read"""
+        targets = frozenset(target for _, target in read_mountinfo())
         return {
-            'root_mounted': self.mount_point.is_mount(),
-            'boot_mounted': (self.mount_point / "boot" / "efi").is_mount(),
+            'root_mounted': str(self.mount_point) in targets,
+            'boot_mounted': str(self.mount_point / "boot" / "efi") in targets,
             'mount_point_exists': self.mount_point.exists()
         }
@@ -4,16 +4,24 @@ Coordinates all installation steps with proper error handling and progress track
 """
 
 import asyncio
+import os
 from pathlib import Path
-from typing import Dict, List, Optional, Callable
+from typing import Dict, List, Optional, Callable, Tuple
 from utils.logging import get_logger
-from config.settings import CONFIG, MOUNT_POINT
+from config.settings import CONFIG, MOUNT_POINT, VALIDATION, KERNELS
 from core.disk import DiskManager
 from core.system import SystemInstaller, SystemInstallError
 from core.profiles import ProfileManager, ProfileError
 
 logger = get_logger(__name__)
 
+# Configuration keys that must be set before installation can start
+REQUIRED_FIELDS = frozenset({
+    'disk', 'hostname', 'username', 'password',
+    'locale', 'timezone', 'kernel'
+})
+KERNEL_NAMES = frozenset(name for name, _ in KERNELS)
+
 class InstallationError(Exception):
     """Custom installation error"""
     pass
@@ -24,18 +32,34 @@ class GamerXInstaller:
     def __init__(self, progress_callback: Optional[Callable[[str, int], None]] = None):
         self.progress_callback = progress_callback
         self.disk_manager = DiskManager()
-        self.system_installer = SystemInstaller(progress_callback)
-        self.profile_manager = ProfileManager()
+        self.system_installer = SystemInstaller(self._threadsafe_progress if progress_callback else None)
+        self.profile_manager = ProfileManager(progress_callback)
         self.mount_point = MOUNT_POINT
+        # Inverse of every irreversible step taken so far, replayed on failure
+        self._undo_stack: List[Tuple[str, Callable[[], None]]] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._prefetch_task: Optional[asyncio.Task] = None
         
     def _update_progress(self, message: str, percentage: int):
         """Update progress if callback is provided"""
         if self.progress_callback:
             self.progress_callback(message, percentage)
-        logger.info(f"Installation Progress {percentage}%: {message}")
+        logger.info("Installation Progress %s%%: %s", percentage, message)
+    
+    def _threadsafe_progress(self, message: str, percentage: int):
+        """Forward SystemInstaller progress, which may come from executor threads, to the event loop"""
+        if self._loop is None:
+            self.progress_callback(message, percentage)
+        else:
+            self._loop.call_soon_threadsafe(self.progress_callback, message, percentage)
+    
+    async def _run_in_executor(self, func: Callable, *args):
+        """Run a blocking SystemInstaller step in a worker thread"""
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
     
     async def run_full_installation(self, config: Dict) -> bool:
         """Run complete installation process"""
+        self._loop = asyncio.get_running_loop()
         try:
             logger.info("Starting GamerX Linux installation...")
             self._update_progress("Starting installation...", 0)
@@ -47,6 +71,12 @@ class GamerXInstaller:
             # Step 1: Prepare disk
             await self._prepare_disk(config)
             
+            # Clone profile sources while pacstrap downloads packages;
+            # both are network bound, so they overlap well
+            profiles = config.get('profiles', [])
+            if profiles:
+                self._prefetch_task = asyncio.create_task(self.profile_manager.prefetch_sources(profiles))
+            
             # Step 2: Install base system
             await self._install_base_system(config)
             
@@ -73,16 +103,25 @@ class GamerXInstaller:
             raise InstallationError(error_msg)
     
     def _validate_config(self, config: Dict) -> bool:
-        """Validate installation configuration"""
-        required_fields = [
-            'disk', 'hostname', 'username', 'password', 
-            'locale', 'timezone', 'kernel'
-        ]
+        """Validate installation configuration, reporting every problem in one pass"""
+        missing = {field for field in REQUIRED_FIELDS if not config.get(field)}
+        if missing:
+            logger.error("Missing required configuration: %s", ', '.join(sorted(missing)))
+            return False
         
-        for field in required_fields:
-            if field not in config or not config[field]:
-                logger.error(f"Missing required configuration: {field}")
-                return False
+        errors = []
+        if not VALIDATION["hostname"].match(config['hostname']):
+            errors.append(f"invalid hostname '{config['hostname']}'")
+        if not VALIDATION["username"].match(config['username']):
+            errors.append(f"invalid username '{config['username']}'")
+        if not str(config['disk']).startswith('/dev/'):
+            errors.append(f"disk '{config['disk']}' is not a /dev path")
+        if config['kernel'] not in KERNEL_NAMES:
+            errors.append(f"unknown kernel '{config['kernel']}'")
+        
+        if errors:
+            logger.error("Invalid configuration: %s", '; '.join(errors))
+            return False
         
         logger.info("Configuration validation passed")
         return True
@@ -93,23 +132,20 @@ class GamerXInstaller:
             self._update_progress("Preparing disk...", 5)
             
             disk_path = config['disk']
+            filesystem = config.get('filesystem', 'ext4')
             swap_size = config.get('swap_size', '2G')
+            if not swap_size or swap_size == "0":
+                swap_size = "none"
             
-            # Unmount any existing mounts
-            self.disk_manager.unmount_all(disk_path)
-            
-            # Partition disk
-            self.disk_manager.auto_partition_disk(disk_path)
+            # Unmount, partition, format, mount and create swap in one step
+            self.disk_manager.auto_partition(disk_path, filesystem, swap_size)
             
-            # Format partitions
-            self.disk_manager.format_partitions(disk_path)
-            
-            # Mount partitions
-            self.disk_manager.mount_partitions(disk_path)
-            
-            # Create swap if requested
-            if swap_size and swap_size != "0":
-                self.disk_manager.create_swap_file(swap_size)
+            # Record how to undo it; popped in reverse, so swap goes before the mounts
+            boot_mount = self.mount_point / "boot" / "efi"
+            self._undo_stack.append(("unmount root", lambda: self.disk_manager.unmount(self.mount_point)))
+            self._undo_stack.append(("unmount boot", lambda: self.disk_manager.unmount(boot_mount)))
+            if swap_size != "none":
+                self._undo_stack.append(("remove swap file", self.disk_manager.remove_swap_file))
             
             self._update_progress("Disk preparation completed", 10)
             
@@ -119,23 +155,33 @@ class GamerXInstaller:
     async def _install_base_system(self, config: Dict):
         """Install base Arch Linux system"""
         try:
-            self._update_progress("Installing base system...", 15)
-            
+            # install_base_system reports its own 10-25% progress from pacstrap
             kernel = config.get('kernel', 'linux')
             additional_packages = config.get('additional_packages', [])
             
-            # Install base system
-            self.system_installer.install_base_system(kernel, additional_packages)
-            
-            # Generate fstab
-            self.system_installer.generate_fstab()
-            
-            # Setup network for chroot
+            # Install base system off the event loop, so the source prefetch keeps running.
+            # Copying the installer files only needs the mounted target, not the
+            # packages, so it runs while pacstrap is still downloading. Only pacstrap
+            # reports progress, and both threads are waited for before an error is
+            # raised, so cleanup never unmounts the target under a running pacstrap
+            results = await asyncio.gather(
+                self._run_in_executor(self.system_installer.install_base_system, kernel, additional_packages),
+                self._run_in_executor(self.system_installer.copy_installer_files, False),
+                return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+            
+            # Generate fstab; this and the network setup run chroot commands,
+            # so they go to the executor like every other blocking step
+            await self._run_in_executor(self.system_installer.generate_fstab)
+            
+            # Setup network for chroot; pacstrap installs its own mirrorlist,
+            # so this has to come after it
             mirror_url = config.get('mirror_url')
-            self.system_installer.setup_network_in_chroot(mirror_url)
-            
-            # Copy installer files
-            self.system_installer.copy_installer_files()
+            await self._run_in_executor(self.system_installer.setup_network_in_chroot, mirror_url)
+            self._undo_stack.append(("release bind mounts", self.system_installer.release_bind_mounts))
             
             self._update_progress("Base system installation completed", 30)
             
@@ -147,29 +193,30 @@ class GamerXInstaller:
         try:
             self._update_progress("Configuring system...", 35)
             
-            # Set hostname
-            self.system_installer.set_hostname(config['hostname'])
-            
-            # Configure locale
             locale = config.get('locale', 'en_US.UTF-8')
-            self.system_installer.configure_locale(locale)
-            
-            # Configure timezone
             timezone = config.get('timezone', 'UTC')
-            self.system_installer.configure_timezone(timezone)
             
-            # Create user
+            # The hostname and locale files are plain writes to disjoint files,
+            # so they go side by side
+            await asyncio.gather(
+                self._run_in_executor(self.system_installer.write_hostname_files, config['hostname']),
+                self._run_in_executor(self.system_installer.write_locale_files, locale)
+            )
+            
+            # locale-gen, timezone and essential services share one chroot session;
+            # arch-chroot is not safe to run twice on the same mount at once
+            await self._run_in_executor(self.system_installer.configure_system, timezone)
+            
+            # User creation and the root password both rewrite /etc/shadow,
+            # so they stay ordered
             username = config['username']
             password = config['password']
             sudo_enabled = config.get('sudo_enabled', True)
-            self.system_installer.create_user(username, password, sudo_enabled)
+            await self._run_in_executor(self.system_installer.create_user, username, password, sudo_enabled)
             
             # Set root password if provided
             if config.get('root_password'):
-                self._set_root_password(config['root_password'])
-            
-            # Enable essential services
-            self.system_installer.enable_services()
+                await self._set_root_password(config['root_password'])
             
             self._update_progress("System configuration completed", 50)
             
@@ -189,37 +236,73 @@ class GamerXInstaller:
             
             username = config['username']
             
+            # Pick up the sources cloned during the base install
+            if self._prefetch_task:
+                try:
+                    await self._prefetch_task
+                except Exception as e:
+                    logger.warning("Source prefetch failed: %s", e)
+            
+            # Validate every profile before the first (slow) install starts
+            validation = self.profile_manager.validate_batch(profiles)
+            invalid = [msg for valid, msg in validation.values() if not valid]
+            if invalid:
+                raise ProfileError(f"Profile validation failed: {'; '.join(invalid)}")
+            
             # Install yay AUR helper first
             try:
-                self.profile_manager.install_yay_and_aur_packages(username)
+                await self.profile_manager.install_yay_and_aur_packages(username)
             except ProfileError as e:
-                logger.warning(f"yay installation failed: {e}")
-            
-            # Install each selected profile
-            for i, profile_name in enumerate(profiles):
-                progress = 60 + (i * 10 // len(profiles))
-                self._update_progress(f"Installing profile: {profile_name}", progress)
-                
-                try:
-                    self.profile_manager.install_profile(profile_name, username)
-                    logger.info(f"Profile {profile_name} installed successfully")
-                except ProfileError as e:
-                    logger.error(f"Profile {profile_name} installation failed: {e}")
-                    # Continue with other profiles
+                logger.warning("yay installation failed: %s", e)
+            
+            # Install each selected profile; progress advances as each one
+            # finishes, so the bar only ever moves forward
+            done = asyncio.Queue()
+            pacman_lock = asyncio.Lock()
+            tasks = [
+                asyncio.create_task(self._install_profile_async(profile_name, username, pacman_lock, done))
+                for profile_name in profiles
+            ]
+            
+            for completed in range(1, len(profiles) + 1):
+                profile_name, ok = await done.get()
+                status = "Installed" if ok else "Failed"
+                self._update_progress(
+                    f"{status} {completed}/{len(profiles)}: {profile_name}",
+                    55 + completed * 13 // len(profiles)
+                )
+            await asyncio.gather(*tasks)
             
             # Install HyDE theme if Hyprland profile is selected
             if 'Hyprland' in profiles:
                 try:
                     self._update_progress("Installing HyDE theme...", 68)
-                    self.profile_manager.install_hyde_theme(username)
+                    await self.profile_manager.install_hyde_theme(username)
                 except Exception as e:
-                    logger.warning(f"HyDE theme installation failed: {e}")
+                    logger.warning("HyDE theme installation failed: %s", e)
             
             self._update_progress("Profile installation completed", 70)
             
         except Exception as e:
             raise InstallationError(f"Profile installation failed: {e}")
     
+    async def _install_profile_async(self, profile_name: str, username: str,
+                                     pacman_lock: asyncio.Lock, done: asyncio.Queue) -> Tuple[str, bool]:
+        """Install one profile and report (profile_name, ok) on the done queue"""
+        ok = False
+        try:
+            # Profiles share the target's pacman lock, so installs take turns
+            async with pacman_lock:
+                await self.profile_manager.install_profile(profile_name, username, validated=True)
+            logger.info("Profile %s installed successfully", profile_name)
+            ok = True
+        except ProfileError as e:
+            # Continue with other profiles
+            logger.error("Profile %s installation failed: %s", profile_name, e)
+        finally:
+            done.put_nowait((profile_name, ok))
+        return profile_name, ok
+    
     async def _finalize_installation(self, config: Dict):
         """Finalize installation with bootloader and cleanup"""
         try:
@@ -227,22 +310,26 @@ class GamerXInstaller:
             
             disk_path = config['disk']
             
-            # Install bootloader
-            self.system_installer.install_bootloader(disk_path)
+            # Install bootloader off the event loop, so its progress reaches the UI live
+            await self._run_in_executor(self.system_installer.install_bootloader, disk_path)
             
             # Install additional packages if specified
             additional_packages = config.get('additional_packages', [])
             if additional_packages:
                 self._update_progress("Installing additional packages...", 90)
-                self.system_installer.install_packages(additional_packages)
+                await self._run_in_executor(self.system_installer.install_packages, additional_packages)
             
             # Apply any custom configurations
             await self._apply_custom_configs(config)
             
             self._update_progress("Finalizing installation...", 95)
             
-            # Sync filesystem
-            await asyncio.create_subprocess_exec('sync')
+            # Flush everything to disk before anything can unmount or reboot;
+            # os.sync blocks until done, so it runs off the event loop
+            await asyncio.get_running_loop().run_in_executor(None, os.sync)
+            
+            # The resolv.conf bind mount would keep the target busy at unmount
+            self.system_installer.release_bind_mounts()
             
             logger.info("Installation finalization completed")
             
@@ -256,44 +343,54 @@ class GamerXInstaller:
             custom_configs = config.get('custom_configs', {})
             
             for config_name, config_value in custom_configs.items():
-                logger.info(f"Applying custom config: {config_name} = {config_value}")
+                logger.info("Applying custom config: %s = %s", config_name, config_value)
                 # Add specific configuration logic here as needed
             
         except Exception as e:
-            logger.warning(f"Custom configuration application failed: {e}")
+            logger.warning("Custom configuration application failed: %s", e)
     
-    def _set_root_password(self, root_password: str):
+    async def _set_root_password(self, root_password: str):
         """Set root password"""
         try:
             chpasswd_input = f"root:{root_password}"
-            self.system_installer._run_chroot_command(["chpasswd"], input_data=chpasswd_input)
+            # Same path as create_user: a blocking chroot call in a worker thread
+            await self._run_in_executor(self.system_installer._run_chroot_command, ["chpasswd"], chpasswd_input)
             logger.info("Root password set successfully")
         except Exception as e:
-            logger.error(f"Failed to set root password: {e}")
+            logger.error("Failed to set root password: %s", e)
     
     async def _cleanup_on_failure(self):
         """Cleanup on installation failure"""
         try:
             logger.info("Performing cleanup after installation failure...")
             
-            # Unmount all partitions
-            if self.mount_point.exists():
-                self.disk_manager.unmount_all_from_mount_point()
+            # Stop a running prefetch before its target is unmounted
+            if self._prefetch_task and not self._prefetch_task.done():
+                self._prefetch_task.cancel()
+                await asyncio.gather(self._prefetch_task, return_exceptions=True)
+            
+            # Roll back side effects newest first; one failed step must not stop the rest
+            while self._undo_stack:
+                description, undo = self._undo_stack.pop()
+                try:
+                    undo()
+                    logger.info("Rolled back: %s", description)
+                except Exception as e:
+                    logger.warning("Rollback step '%s' failed: %s", description, e)
             
             logger.info("Cleanup completed")
             
         except Exception as e:
-            logger.error(f"Cleanup failed: {e}")
+            logger.error("Cleanup failed: %s", e)
     
-    def get_installation_summary(self, config: Dict) -> Dict[str, any]:
+    async def get_installation_summary(self, config: Dict) -> Dict[str, any]:
         """Get installation summary for confirmation"""
         try:
             profiles = config.get('profiles', [])
-            profile_info = []
-            
-            for profile_name in profiles:
-                summary = self.profile_manager.get_profile_summary(profile_name)
-                profile_info.append(summary)
+            profile_info = await asyncio.gather(*[
+                self.profile_manager.get_profile_summary(profile_name)
+                for profile_name in profiles
+            ])
             
             return {
                 'disk': config.get('disk', 'Unknown'),
@@ -310,7 +407,7 @@ class GamerXInstaller:
             }
             
         except Exception as e:
-            logger.error(f"Error generating installation summary: {e}")
+            logger.error("Error generating installation summary: %s", e)
             return {'error': str(e)}
     
     def _estimate_installation_time(self, config: Dict) -> str:
@@ -3,15 +3,55 @@ Profile management and validation system
 Handles profile detection, validation, and execution
 """
 
+import asyncio
+import os
 import subprocess
 import shutil
+from collections import OrderedDict, deque
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
-from utils.logging import get_logger
+from typing import Any, Awaitable, Callable, List, Dict, Optional, Tuple
+from utils.logging import get_logger, current_profile
 from config.settings import PROFILES_DIR, TARGET_PROFILES_DIR, TARGET_INSTALLER_DIR, MOUNT_POINT
 
 logger = get_logger(__name__)
 
+# stderr fragments of network failures that are worth retrying
+TRANSIENT_ERRORS = (
+    "Could not resolve host",
+    "HTTP 5",
+    "The requested URL returned error: 5",
+    "timed out",
+    "Connection reset",
+    "Connection refused",
+    "early EOF",
+)
+
+# Percentage passed with streamed command output, meaning "leave the bar where it is"
+PROGRESS_UNCHANGED = -2
+
+# Lines of command output kept for error messages
+OUTPUT_TAIL_LINES = 100
+
+# Longest single output line accepted from a chroot command (pacman redraws with \r)
+STREAM_LIMIT = 1024 * 1024
+
+# Source trees cloned on the host while pacstrap runs; they live under the
+# target's /var/tmp because arch-chroot mounts a fresh tmpfs over /tmp
+SOURCE_REPOS = {
+    'yay': 'https://aur.archlinux.org/yay.git',
+    'HyDE': 'https://github.com/prasanthrangan/hyprdots.git',
+}
+
+# Icon and description shown for each known profile
+_PROFILE_META = {
+    'Hyprland': ('🪟', 'Modern tiling window manager with beautiful animations'),
+    'Gaming': ('🎮', 'Optimized gaming setup with Steam, Lutris, and performance tools'),
+    'Hacking': ('🔐', 'Security and penetration testing tools collection'),
+    'Development': ('💻', 'Complete development environment with IDEs and tools'),
+    'Multimedia': ('🎨', 'Media creation and editing software suite'),
+}
+_DEFAULT_META = ('📦', 'Custom profile configuration')
+
 class ProfileError(Exception):
     """Custom profile error"""
     pass
@@ -19,27 +59,73 @@ class ProfileError(Exception):
 class ProfileManager:
     """Manages installation profiles with validation"""
     
-    def __init__(self):
+    # Maximum number of profiles kept in each parsed-result cache
+    CACHE_SIZE = 64
+    
+    def __init__(self, progress_callback: Optional[Callable[[str, int], None]] = None):
+        self.progress_callback = progress_callback
         self.profiles_dir = PROFILES_DIR
         self.target_profiles_dir = TARGET_PROFILES_DIR
         self.target_installer_dir = TARGET_INSTALLER_DIR
         self.mount_point = MOUNT_POINT
+        self._mount_str = str(MOUNT_POINT)
+        self._packages_cache: OrderedDict = OrderedDict()
+        self._summary_cache: OrderedDict = OrderedDict()
+        self._prefetched: set = set()
     
-    def discover_profiles(self) -> List[Dict[str, str]]:
-        """Discover available profiles with validation"""
-        profiles = []
-        
+    def _profile_signature(self, profile_name: str) -> Tuple[int, ...]:
+        """Modification times that change whenever a profile's contents do"""
+        profile_dir = self.profiles_dir / profile_name
+        signature = []
+        for path in (profile_dir, profile_dir / "install.sh", profile_dir / "packages" / "package-list.txt"):
+            try:
+                signature.append(path.stat().st_mtime_ns)
+            except OSError:
+                signature.append(0)
+        return tuple(signature)
+    
+    def _cache_get(self, cache: OrderedDict, profile_name: str, signature: Tuple[int, ...]) -> Optional[Any]:
+        """Return a cached value if the profile has not changed since it was stored"""
+        entry = cache.get(profile_name)
+        if entry is None or entry[0] != signature:
+            return None
+        cache.move_to_end(profile_name)
+        return entry[1]
+    
+    def _cache_put(self, cache: OrderedDict, profile_name: str, signature: Tuple[int, ...], value: Any):
+        """Store a value, evicting the least recently used profile when full"""
+        cache[profile_name] = (signature, value)
+        cache.move_to_end(profile_name)
+        if len(cache) > self.CACHE_SIZE:
+            cache.popitem(last=False)
+    
+    def invalidate(self, profile_name: Optional[str] = None):
+        """Drop cached data for one profile, or for all profiles"""
+        if profile_name is None:
+            self._packages_cache.clear()
+            self._summary_cache.clear()
+        else:
+            self._packages_cache.pop(profile_name, None)
+            self._summary_cache.pop(profile_name, None)
+    
+    async def discover_profiles(self) -> List[Dict[str, str]]:
+        """Discover available profiles, validating them concurrently in worker threads"""
         if not self.profiles_dir.exists():
-            logger.warning(f"Profiles directory not found: {self.profiles_dir}")
-            return profiles
+            logger.warning("Profiles directory not found: %s", self.profiles_dir)
+            return []
         
-        for profile_dir in self.profiles_dir.iterdir():
-            if profile_dir.is_dir():
-                profile_info = self._validate_profile(profile_dir)
-                if profile_info:
-                    profiles.append(profile_info)
+        # _validate_profile stays synchronous so each call can run in its own thread
+        loop = asyncio.get_running_loop()
+        # DirEntry.is_dir() answers from the directory listing, without a stat per entry
+        with os.scandir(self.profiles_dir) as entries:
+            profile_dirs = [Path(entry.path) for entry in entries if entry.is_dir(follow_symlinks=False)]
+        results = await asyncio.gather(*[
+            loop.run_in_executor(None, self._validate_profile, profile_dir)
+            for profile_dir in profile_dirs
+        ])
+        profiles = [profile_info for profile_info in results if profile_info]
         
-        logger.info(f"Discovered {len(profiles)} valid profiles")
+        logger.info("Discovered %s valid profiles", len(profiles))
         return profiles
     
     def _validate_profile(self, profile_path: Path) -> Optional[Dict[str, str]]:
@@ -53,34 +139,28 @@ class ProfileManager:
             package_list = packages_dir / "package-list.txt"
             
             if not install_script.exists():
-                logger.warning(f"Profile {profile_name}: missing install.sh")
+                logger.warning("Profile %s: missing install.sh", profile_name)
                 return None
             
             if not package_list.exists():
-                logger.warning(f"Profile {profile_name}: missing package-list.txt")
+                logger.warning("Profile %s: missing package-list.txt", profile_name)
                 return None
             
             # Check if install.sh is executable
             if not install_script.stat().st_mode & 0o111:
-                logger.info(f"Profile {profile_name}: making install.sh executable")
+                logger.info("Profile %s: making install.sh executable", profile_name)
                 install_script.chmod(0o755)
             
-            # Count packages
-            package_count = 0
+            # Parse the package list once; the count comes from the same list
+            packages = []
             try:
-                with open(package_list, 'r') as f:
-                    for line in f:
-                        line = line.strip()
-                        if line and not line.startswith('#'):
-                            package_count += 1
+                packages = self._parse_package_list(package_list)
             except Exception as e:
-                logger.warning(f"Profile {profile_name}: error reading package list: {e}")
-            
-            # Get profile description
-            description = self._get_profile_description(profile_name)
+                logger.warning("Profile %s: error reading package list: %s", profile_name, e)
+            package_count = len(packages)
             
-            # Get profile icon
-            icon = self._get_profile_icon(profile_name)
+            # Get profile icon and description
+            icon, description = self._meta(profile_name)
             
             return {
                 'name': profile_name,
@@ -88,35 +168,27 @@ class ProfileManager:
                 'description': description,
                 'icon': icon,
                 'package_count': package_count,
+                'packages': packages,
                 'display': f"{icon} {profile_name}",
                 'details': f"{description} ({package_count} packages)"
             }
             
         except Exception as e:
-            logger.error(f"Profile validation failed for {profile_path}: {e}")
+            logger.error("Profile validation failed for %s: %s", profile_path, e)
             return None
     
-    def _get_profile_description(self, profile_name: str) -> str:
-        """Get profile description"""
-        descriptions = {
-            'Hyprland': 'Modern tiling window manager with beautiful animations',
-            'Gaming': 'Optimized gaming setup with Steam, Lutris, and performance tools',
-            'Hacking': 'Security and penetration testing tools collection',
-            'Development': 'Complete development environment with IDEs and tools',
-            'Multimedia': 'Media creation and editing software suite'
-        }
-        return descriptions.get(profile_name, 'Custom profile configuration')
+    @staticmethod
+    def _parse_package_list(path: Path) -> List[str]:
+        """Read a package-list.txt, skipping blank lines and comments"""
+        return [
+            line for line in (raw.strip() for raw in path.read_text().splitlines())
+            if line and not line.startswith('#')
+        ]
     
-    def _get_profile_icon(self, profile_name: str) -> str:
-        """Get profile icon emoji"""
-        icons = {
-            'Hyprland': '🪟',
-            'Gaming': '🎮',
-            'Hacking': '🔐',
-            'Development': '💻',
-            'Multimedia': '🎨'
-        }
-        return icons.get(profile_name, '📦')
+    @classmethod
+    def _meta(cls, profile_name: str) -> Tuple[str, str]:
+        """Get profile icon emoji and description"""
+        return _PROFILE_META.get(profile_name, _DEFAULT_META)
     
     def validate_profile_in_target(self, profile_name: str) -> Tuple[bool, str]:
         """Validate profile exists in target system"""
@@ -146,8 +218,46 @@ class ProfileManager:
         except Exception as e:
             return False, f"Profile validation error: {e}"
     
+    def validate_batch(self, profile_names: List[str]) -> Dict[str, Tuple[bool, str]]:
+        """
+        Validate several profiles in the target at once
+        The profile and installer directories are each listed a single time
+        """
+        def list_entries(directory: Path) -> set:
+            try:
+                with os.scandir(directory) as entries:
+                    return {entry.name for entry in entries}
+            except OSError:
+                return set()
+        
+        present_profiles = list_entries(self.target_profiles_dir)
+        installer_scripts = list_entries(self.target_installer_dir)
+        
+        results = {}
+        for profile_name in profile_names:
+            target_profile_dir = self.target_profiles_dir / profile_name
+            script_name = f"install_{profile_name.lower()}.sh"
+            
+            if profile_name not in present_profiles:
+                results[profile_name] = (False, f"Profile directory not found in target: {target_profile_dir}")
+            elif not (target_profile_dir / "install.sh").exists():
+                results[profile_name] = (False, f"install.sh not found: {target_profile_dir / 'install.sh'}")
+            elif not (target_profile_dir / "packages" / "package-list.txt").exists():
+                results[profile_name] = (False, f"package-list.txt not found: {target_profile_dir / 'packages' / 'package-list.txt'}")
+            elif script_name not in installer_scripts:
+                results[profile_name] = (False, f"Installer script not found: {self.target_installer_dir / script_name}")
+            else:
+                results[profile_name] = (True, f"Profile {profile_name} validated in target system")
+        
+        return results
+    
     def get_profile_packages(self, profile_name: str) -> List[str]:
         """Get list of packages for a profile"""
+        signature = self._profile_signature(profile_name)
+        cached = self._cache_get(self._packages_cache, profile_name, signature)
+        if cached is not None:
+            return cached
+        
         packages = []
         
         try:
@@ -155,65 +265,124 @@ class ProfileManager:
             package_list = profile_dir / "packages" / "package-list.txt"
             
             if package_list.exists():
-                with open(package_list, 'r') as f:
-                    for line in f:
-                        line = line.strip()
-                        if line and not line.startswith('#'):
-                            packages.append(line)
+                packages = self._parse_package_list(package_list)
             
-            logger.info(f"Profile {profile_name}: {len(packages)} packages")
+            logger.info("Profile %s: %s packages", profile_name, len(packages))
+            self._cache_put(self._packages_cache, profile_name, signature, packages)
             
         except Exception as e:
-            logger.error(f"Error reading packages for {profile_name}: {e}")
+            logger.error("Error reading packages for %s: %s", profile_name, e)
         
         return packages
     
-    def install_profile(self, profile_name: str, username: str) -> bool:
-        """Install a profile using the installer script"""
+    async def install_profile(self, profile_name: str, username: str, validated: bool = False) -> bool:
+        """
+        Install a profile using the installer script
+        Pass validated=True when validate_batch already checked the profile
+        """
+        profile_token = current_profile.set(profile_name)
         try:
-            logger.info(f"Installing profile: {profile_name}")
+            logger.info("Installing profile: %s", profile_name)
             
             # Validate profile exists in target
-            valid, msg = self.validate_profile_in_target(profile_name)
-            if not valid:
-                raise ProfileError(f"Profile validation failed: {msg}")
+            if not validated:
+                valid, msg = self.validate_profile_in_target(profile_name)
+                if not valid:
+                    raise ProfileError(f"Profile validation failed: {msg}")
             
             # Get installer script path
             installer_script = self.target_installer_dir / f"install_{profile_name.lower()}.sh"
             
+            # Same script as seen from inside the chroot
+            script_path = "/" + str(installer_script.relative_to(self.mount_point))
+            
             # Make sure script is executable
-            self._run_chroot_command(["chmod", "+x", str(installer_script).replace(str(self.mount_point), "")])
+            await self._run_chroot_command(["chmod", "+x", script_path])
             
             # Run installer script
-            script_path = str(installer_script).replace(str(self.mount_point), "")
-            result = self._run_chroot_command([script_path])
+            result = await self._run_chroot_command([script_path])
             
-            logger.info(f"Profile {profile_name} installation completed")
+            # The script may have changed the profile's files, so reread them next time
+            self.invalidate(profile_name)
+            
+            logger.info("Profile %s installation completed", profile_name)
             return True
             
         except Exception as e:
             error_msg = f"Profile installation failed: {e}"
             logger.error(error_msg)
             raise ProfileError(error_msg)
+        finally:
+            current_profile.reset(profile_token)
+    
+    async def prefetch_sources(self, profiles: List[str]) -> set:
+        """
+        Clone yay, and HyDE when Hyprland is selected, into the target from the host
+        Meant to run alongside pacstrap; failed clones fall back to cloning at install time
+        """
+        names = ['yay'] + (['HyDE'] if 'Hyprland' in profiles else [])
+        
+        target_dir = self.mount_point / "var" / "tmp"
+        
+        def prepare_target_dir():
+            target_dir.mkdir(parents=True, exist_ok=True)
+            # Match the filesystem package, which leaves existing directory modes alone
+            target_dir.chmod(0o1777)
+        
+        # Filesystem work runs in worker threads so pacstrap's progress keeps flowing
+        await asyncio.to_thread(prepare_target_dir)
+        
+        async def clone(name: str) -> Optional[str]:
+            destination = target_dir / name
+            await asyncio.to_thread(shutil.rmtree, destination, ignore_errors=True)
+            
+            proc = await asyncio.create_subprocess_exec(
+                'git', 'clone', '--depth', '1', SOURCE_REPOS[name], str(destination),
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE
+            )
+            try:
+                _, stderr = await proc.communicate()
+            except asyncio.CancelledError:
+                # Cancelling communicate() leaves git running; kill and reap it so
+                # the rollback can unmount the target it is writing into
+                proc.kill()
+                await proc.wait()
+                raise
+            if proc.returncode != 0:
+                logger.warning("Prefetching %s failed, cloning it during installation instead: %s",
+                               name, stderr.decode(errors='replace').strip())
+                return None
+            
+            logger.info("Prefetched %s sources", name)
+            return name
+        
+        results = await asyncio.gather(*[clone(name) for name in names])
+        self._prefetched = {name for name in results if name}
+        return self._prefetched
     
-    def install_yay_and_aur_packages(self, username: str) -> bool:
+    async def install_yay_and_aur_packages(self, username: str) -> bool:
         """Install yay AUR helper and any AUR packages"""
         try:
             logger.info("Installing yay AUR helper...")
             
-            # Switch to user for yay installation
-            yay_commands = [
-                "cd /tmp",
-                "git clone https://aur.archlinux.org/yay.git",
-                "cd yay",
-                "makepkg -si --noconfirm --break-system-packages"
-            ]
-            
-            # Run as user
-            for cmd in yay_commands:
-                self._run_chroot_command([
-                    "su", "-", username, "-c", cmd
-                ])
+            if 'yay' in self._prefetched:
+                # Cloned by prefetch_sources as root; hand it to the user who builds it
+                await self._run_chroot_command(["chown", "-R", f"{username}:", "/var/tmp/yay"])
+                yay_command = "cd /var/tmp/yay && makepkg -si --noconfirm"
+            else:
+                # One shell, so each cd carries over to the next step
+                yay_command = (
+                    "cd /tmp && rm -rf yay && "
+                    f"git clone {SOURCE_REPOS['yay']} && "
+                    "cd yay && "
+                    "makepkg -si --noconfirm"
+                )
+            
+            # Run as user, retrying transient network failures
+            await self._retry(lambda: self._run_chroot_command([
+                "su", "-", username, "-c", yay_command
+            ]))
             
             logger.info("yay installed successfully")
             return True
@@ -223,49 +392,123 @@ class ProfileManager:
             logger.error(error_msg)
             raise ProfileError(error_msg)
     
-    def install_hyde_theme(self, username: str) -> bool:
+    async def install_hyde_theme(self, username: str) -> bool:
         """Install HyDE theme for Hyprland"""
         try:
             logger.info("Installing HyDE theme...")
             
-            # Clone HyDE repository
-            hyde_commands = [
-                "cd /tmp",
-                "git clone --depth 1 https://github.com/prasanthrangan/hyprdots.git HyDE",
-                "cd HyDE",
-                "./install.sh"
-            ]
-            
-            # Run as user
-            for cmd in hyde_commands:
-                self._run_chroot_command([
-                    "su", "-", username, "-c", cmd
-                ])
+            if 'HyDE' in self._prefetched:
+                await self._run_chroot_command(["chown", "-R", f"{username}:", "/var/tmp/HyDE"])
+                hyde_command = "cd /var/tmp/HyDE && ./install.sh"
+            else:
+                # Clone HyDE repository and run its installer in one shell
+                hyde_command = (
+                    "cd /tmp && rm -rf HyDE && "
+                    f"git clone --depth 1 {SOURCE_REPOS['HyDE']} HyDE && "
+                    "cd HyDE && "
+                    "./install.sh"
+                )
+            
+            # Run as user, retrying transient network failures
+            await self._retry(lambda: self._run_chroot_command([
+                "su", "-", username, "-c", hyde_command
+            ]))
             
             logger.info("HyDE theme installed successfully")
             return True
             
         except Exception as e:
-            logger.warning(f"HyDE theme installation failed: {e}")
+            logger.warning("HyDE theme installation failed: %s", e)
             # Don't fail the entire installation for theme issues
             return False
     
-    def _run_chroot_command(self, command: List[str]) -> subprocess.CompletedProcess:
-        """Run command in chroot environment"""
-        chroot_cmd = ["arch-chroot", str(self.mount_point)] + command
+    async def _retry(self, coro_factory: Callable[[], Awaitable[Any]], attempts: int = 3, base: float = 2.0) -> Any:
+        """
+        Await coro_factory(), retrying with exponential backoff when the
+        command failed for a known transient network reason
+        """
+        for attempt in range(attempts):
+            try:
+                return await coro_factory()
+            except subprocess.CalledProcessError as e:
+                stderr = e.stderr or ""
+                transient = any(pattern in stderr for pattern in TRANSIENT_ERRORS)
+                if not transient or attempt == attempts - 1:
+                    raise
+                
+                delay = base ** attempt
+                logger.warning("Transient failure (%s), retrying in %.0fs...", stderr.strip().splitlines()[-1], delay)
+                await asyncio.sleep(delay)
+    
+    async def _run_chroot_command(self, command: List[str], input_data: str = None) -> subprocess.CompletedProcess:
+        """
+        Run command in chroot environment without blocking the event loop
+        Output is streamed to the progress callback line by line; only the
+        last OUTPUT_TAIL_LINES are kept for error reporting
+        """
+        chroot_cmd = ["arch-chroot", self._mount_str] + command
         
-        logger.debug(f"Running chroot command: {' '.join(chroot_cmd)}")
+        logger.debug("Running chroot command: %s", ' '.join(chroot_cmd))
         
-        result = subprocess.run(
-            chroot_cmd,
-            capture_output=True,
-            text=True,
-            check=True
+        # stderr is merged so lines arrive in order and one reader can't deadlock the other
+        proc = await asyncio.create_subprocess_exec(
+            *chroot_cmd,
+            stdin=asyncio.subprocess.PIPE if input_data else None,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            limit=STREAM_LIMIT
         )
         
+        tail = deque(maxlen=OUTPUT_TAIL_LINES)
+        try:
+            if input_data:
+                proc.stdin.write(input_data.encode())
+                await proc.stdin.drain()
+                proc.stdin.close()
+            
+            async for raw_line in proc.stdout:
+                line = raw_line.decode(errors='replace').rstrip()
+                if not line:
+                    continue
+                tail.append(line)
+                if self.progress_callback:
+                    self.progress_callback(line, PROGRESS_UNCHANGED)
+            
+            await proc.wait()
+        finally:
+            # Cancelled, or a line longer than STREAM_LIMIT: don't leave the child running unreaped
+            if proc.returncode is None:
+                try:
+                    proc.kill()
+                except ProcessLookupError:
+                    pass
+                await proc.wait()
+        
+        output = "\n".join(tail)
+        result = subprocess.CompletedProcess(chroot_cmd, proc.returncode, output, output)
+        # Keep the check=True semantics of the old subprocess.run call
+        result.check_returncode()
+        
         return result
     
-    def get_profile_summary(self, profile_name: str) -> Dict[str, any]:
+    @staticmethod
+    def _get_directory_size(directory: Path) -> int:
+        """Total size of all files below a directory"""
+        total_size = 0
+        pending = [directory]
+        
+        # DirEntry carries the file type from the listing, so each file costs one stat
+        while pending:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        total_size += entry.stat(follow_symlinks=False).st_size
+        
+        return total_size
+    
+    async def get_profile_summary(self, profile_name: str) -> Dict[str, any]:
         """Get comprehensive profile information"""
         try:
             profile_dir = self.profiles_dir / profile_name
@@ -273,14 +516,19 @@ class ProfileManager:
             if not profile_dir.exists():
                 return {'error': f'Profile {profile_name} not found'}
             
+            # Serve unchanged profiles from memory
+            signature = self._profile_signature(profile_name)
+            cached = self._cache_get(self._summary_cache, profile_name, signature)
+            if cached is not None:
+                return cached
+            
             # Get packages
             packages = self.get_profile_packages(profile_name)
             
-            # Get file sizes
-            total_size = 0
-            for file_path in profile_dir.rglob('*'):
-                if file_path.is_file():
-                    total_size += file_path.stat().st_size
+            # Walk the profile tree for file sizes off the event loop
+            total_size = await asyncio.get_running_loop().run_in_executor(
+                None, self._get_directory_size, profile_dir
+            )
             
             # Check for additional scripts
             additional_scripts = []
@@ -288,16 +536,19 @@ class ProfileManager:
                 if script.name != 'install.sh':
                     additional_scripts.append(script.name)
             
-            return {
+            icon, description = self._meta(profile_name)
+            summary = {
                 'name': profile_name,
                 'package_count': len(packages),
                 'packages': packages,
                 'total_size_bytes': total_size,
                 'additional_scripts': additional_scripts,
-                'description': self._get_profile_description(profile_name),
-                'icon': self._get_profile_icon(profile_name)
+                'description': description,
+                'icon': icon
             }
+            self._cache_put(self._summary_cache, profile_name, signature, summary)
+            return summary
             
         except Exception as e:
-            logger.error(f"Error getting profile summary: {e}")
+            logger.error("Error getting profile summary: %s", e)
             return {'error': str(e)}
@@ -6,13 +6,210 @@ Handles pacstrap, chroot, and system configuration
 import subprocess
 import shutil
 import os
+import re
+import errno
+import shlex
+import warnings
+import threading
+import time
+import tempfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Optional, Callable
 from utils.logging import get_logger
-from config.settings import MOUNT_POINT, CONFIG
+from config.settings import MOUNT_POINT, CONFIG, PACMAN_CONF, PARALLEL_DOWNLOADS, PREFETCH_PARALLEL
 
 logger = get_logger(__name__)
 
+# Services every installation needs at boot
+ESSENTIAL_SERVICES = ("NetworkManager", "systemd-timesyncd")
+
+PARALLEL_DOWNLOADS_RE = re.compile(r'^#?\s*ParallelDownloads\s*=.*$', re.M)
+COLOR_RE = re.compile(r'^#\s*Color\s*$', re.M)
+
+# pacman prints one "( 3/120) installing foo" line per package
+INSTALL_PROGRESS_RE = re.compile(r'^\(\s*(\d+)/(\d+)\) installing (\S+)')
+# A package command that prints nothing for this long is assumed hung
+STALL_TIMEOUT = 1800
+WATCHDOG_INTERVAL = 10
+# Lines of output kept for error messages
+OUTPUT_TAIL_LINES = 100
+# Package databases synced more recently than this are not refreshed again
+DB_SYNC_MAX_AGE = 3600
+
+# In-kernel copy tuning for _fast_copyfile
+COPY_CHUNK = 1 << 30
+COPY_BUFFER_SIZE = 1 << 20
+COPY_FALLBACK_ERRNOS = frozenset({errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP})
+RSYNC = shutil.which("rsync")
+
+# Live system's pacman database; its sync DBs seed the prefetch resolver
+PACMAN_DB_DIR = Path("/var/lib/pacman")
+
+def _enable_parallel_downloads(conf_path: Path) -> bool:
+    """
+    Turn on ParallelDownloads and Color in a pacman.conf
+    Returns True if the file was rewritten; re-runs are no-ops
+    """
+    content = conf_path.read_text()
+    wanted = f"ParallelDownloads = {PARALLEL_DOWNLOADS}"
+    
+    updated, count = PARALLEL_DOWNLOADS_RE.subn(wanted, content)
+    if not count:
+        # No commented template to replace, so add it to [options]
+        updated = updated.replace("[options]\n", f"[options]\n{wanted}\n", 1)
+    updated = COLOR_RE.sub("Color", updated)
+    
+    if updated == content:
+        return False
+    
+    # Write beside the original and swap it in, so pacman never sees half a file
+    tmp_path = conf_path.with_name(conf_path.name + ".gxtmp")
+    tmp_path.write_text(updated)
+    os.replace(tmp_path, conf_path)
+    return True
+
+# Per-thread copy buffer, so _fast_copytree's workers don't allocate one per file
+_copy_buffers = threading.local()
+
+def _copy_buffer() -> memoryview:
+    """Return this thread's reusable COPY_BUFFER_SIZE buffer"""
+    view = getattr(_copy_buffers, "view", None)
+    if view is None:
+        view = _copy_buffers.view = memoryview(bytearray(COPY_BUFFER_SIZE))
+    return view
+
+def _fast_copyfile(src: str, dst: str):
+    """
+    Copy file contents from src to dst inside the kernel
+    Tries copy_file_range (reflinks on btrfs/XFS), then sendfile, then
+    a plain loop over a 1 MiB buffer
+    """
+    src_fd = os.open(src, os.O_RDONLY | os.O_CLOEXEC)
+    try:
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_CLOEXEC, 0o644)
+        try:
+            os.posix_fadvise(src_fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            copied = 0
+            try:
+                while n := os.copy_file_range(src_fd, dst_fd, COPY_CHUNK):
+                    copied += n
+                return
+            except OSError as e:
+                if e.errno not in COPY_FALLBACK_ERRNOS:
+                    raise
+            try:
+                while n := os.sendfile(dst_fd, src_fd, copied, COPY_CHUNK):
+                    copied += n
+                return
+            except OSError as e:
+                if e.errno not in COPY_FALLBACK_ERRNOS:
+                    raise
+            os.lseek(src_fd, copied, os.SEEK_SET)
+            os.lseek(dst_fd, copied, os.SEEK_SET)
+            with open(src_fd, 'rb', buffering=0, closefd=False) as fsrc:
+                view = _copy_buffer()
+                while n := fsrc.readinto(view):
+                    os.write(dst_fd, view[:n])
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+
+def _copy_entry(entry: os.DirEntry, dst: str):
+    """Copy one regular file, reusing the stat cached on its DirEntry"""
+    st = entry.stat(follow_symlinks=False)
+    _fast_copyfile(entry.path, dst)
+    os.chmod(dst, st.st_mode & 0o7777)
+    os.utime(dst, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+def _remove_entry(entry: os.DirEntry):
+    """Delete a file, symlink or whole directory found while walking a tree"""
+    if entry.is_dir(follow_symlinks=False):
+        shutil.rmtree(entry.path)
+    else:
+        os.unlink(entry.path)
+
+def _fast_copytree(src: Path, dst: Path, workers: int = 8):
+    """
+    Mirror a directory tree into dst, like rsync -a --delete
+    Walks with os.scandir so each entry is stat'ed once, and copies
+    file bodies on a thread pool. Files whose size and mtime already
+    match in dst are left alone, and entries missing from src are removed
+    """
+    directories = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = []
+        stack = [(str(src), str(dst), os.stat(src))]
+        while stack:
+            src_dir, dst_dir, dir_st = stack.pop()
+            os.makedirs(dst_dir, exist_ok=True)
+            with os.scandir(dst_dir) as it:
+                existing = {entry.name: entry for entry in it}
+            with os.scandir(src_dir) as it:
+                for entry in it:
+                    target = os.path.join(dst_dir, entry.name)
+                    current = existing.pop(entry.name, None)
+                    if entry.is_symlink():
+                        if current is not None:
+                            _remove_entry(current)
+                        os.symlink(os.readlink(entry.path), target)
+                    elif entry.is_dir(follow_symlinks=False):
+                        if current is not None and not current.is_dir(follow_symlinks=False):
+                            _remove_entry(current)
+                        stack.append((entry.path, target, entry.stat(follow_symlinks=False)))
+                    else:
+                        if current is not None:
+                            if current.is_file(follow_symlinks=False):
+                                st = entry.stat(follow_symlinks=False)
+                                current_st = current.stat(follow_symlinks=False)
+                                if (st.st_size, st.st_mtime_ns) == (current_st.st_size, current_st.st_mtime_ns):
+                                    continue
+                            else:
+                                _remove_entry(current)
+                        futures.append(pool.submit(_copy_entry, entry, target))
+            # Whatever is left no longer exists in src
+            for stale in existing.values():
+                _remove_entry(stale)
+            directories.append((dst_dir, dir_st))
+        
+        for future in futures:
+            future.result()
+    
+    # Directory metadata goes last, since filling a directory bumps its mtime
+    for dst_dir, st in directories:
+        os.chmod(dst_dir, st.st_mode & 0o7777)
+        os.utime(dst_dir, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+def _sync_tree(src: Path, dst: Path):
+    """Make dst an exact copy of src, with rsync if the live system has it"""
+    if RSYNC:
+        subprocess.run(
+            [RSYNC, "-aHAX", "--delete", "--numeric-ids", f"{src}/", f"{dst}/"],
+            capture_output=True,
+            text=True,
+            check=True
+        )
+    else:
+        _fast_copytree(src, dst)
+
+def _write_small(path: Path, data: str):
+    """Write a small config file with one write call and no Python file object"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_CLOEXEC, 0o644)
+    try:
+        os.write(fd, data.encode())
+    finally:
+        os.close(fd)
+
+def _read_small(path: Path) -> str:
+    """Read a config file with one read call sized from fstat"""
+    fd = os.open(path, os.O_RDONLY | os.O_CLOEXEC)
+    try:
+        return os.read(fd, os.fstat(fd).st_size).decode()
+    finally:
+        os.close(fd)
+
 class SystemInstallError(Exception):
     """Custom system installation error"""
     pass
@@ -23,12 +220,18 @@ class SystemInstaller:
     def __init__(self, progress_callback: Optional[Callable[[str, int], None]] = None):
         self.mount_point = MOUNT_POINT
         self.progress_callback = progress_callback
+        # Compiled locale.gen patterns, keyed by locale
+        self._locale_patterns: Dict[str, re.Pattern] = {}
+        # Bind mounts into the target, released by release_bind_mounts
+        self._bind_mounts: List[Path] = []
+        # When pacstrap last synced the target's package databases
+        self._db_synced_at: Optional[float] = None
         
     def _update_progress(self, message: str, percentage: int):
         """Update progress if callback is provided"""
         if self.progress_callback:
             self.progress_callback(message, percentage)
-        logger.info(f"Progress {percentage}%: {message}")
+        logger.info("Progress %s%%: %s", percentage, message)
     
     def install_base_system(self, kernel: str = "linux", additional_packages: List[str] = None) -> bool:
         """Install base Arch Linux system with pacstrap"""
@@ -46,25 +249,31 @@ class SystemInstaller:
             if additional_packages:
                 base_packages.extend(additional_packages)
             
-            logger.info(f"Installing packages: {' '.join(base_packages)}")
+            logger.info("Installing packages: %s", ' '.join(base_packages))
+            
+            # Let pacstrap download from the mirrors in parallel
+            if PACMAN_CONF.exists() and _enable_parallel_downloads(PACMAN_CONF):
+                logger.info("Parallel downloads enabled in %s", PACMAN_CONF)
+            
+            # Fill the target's package cache first, pacstrap then only verifies and installs
+            try:
+                fetched = self._prefetch_packages(base_packages)
+                logger.info("Prefetched %s packages", fetched)
+            except Exception as e:
+                logger.warning("Package prefetch failed, pacstrap will download: %s", e)
             
             # Run pacstrap
             cmd = ["pacstrap", str(self.mount_point)] + base_packages
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=1800  # 30 minute timeout
-            )
-            
-            if result.returncode != 0:
-                error_msg = f"pacstrap failed: {result.stderr}"
-                logger.error(error_msg)
-                raise SystemInstallError(error_msg)
+            self._run_streaming(cmd, 10, 25)
+            self._db_synced_at = time.monotonic()
             
             self._update_progress("Base system installed successfully", 25)
             return True
             
+        except subprocess.CalledProcessError as e:
+            error_msg = f"pacstrap failed: {e.output}"
+            logger.error(error_msg)
+            raise SystemInstallError(error_msg)
         except subprocess.TimeoutExpired:
             error_msg = "Base system installation timed out"
             logger.error(error_msg)
@@ -74,6 +283,81 @@ class SystemInstaller:
             logger.error(error_msg)
             raise SystemInstallError(error_msg)
     
+    def _prefetch_packages(self, packages: List[str]) -> int:
+        """
+        Download packages and their dependencies into the target's pacman cache
+        with parallel curl transfers, so the link is saturated whatever the
+        pacman version. Returns the number of packages fetched
+        """
+        if not shutil.which("curl"):
+            return 0
+        
+        # Ask pacman for the URLs it would download, dependencies included.
+        # Resolving against the live system's local DB would drop everything
+        # already installed on the ISO, so use a scratch dbpath with an empty
+        # local DB, seeded with the host's sync DBs and refreshed with -Sy
+        with tempfile.TemporaryDirectory(prefix="gx-pacman-db-") as db_path:
+            host_sync = PACMAN_DB_DIR / "sync"
+            if host_sync.is_dir():
+                shutil.copytree(host_sync, Path(db_path) / "sync")
+            subprocess.run(
+                ["pacman", "--dbpath", db_path, "-Sy", "--noconfirm"],
+                capture_output=True,
+                text=True,
+                check=True
+            )
+            result = subprocess.run(
+                ["pacman", "--dbpath", db_path, "-Sp", "--noconfirm", *packages],
+                capture_output=True,
+                text=True,
+                check=True
+            )
+        
+        # pacstrap uses the target's cache by default, which is on disk
+        # rather than in the live ISO's RAM overlay
+        cache_dir = self.mount_point / "var" / "cache" / "pacman" / "pkg"
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Download to .part names and only move finished files in place,
+        # so pacman never sees a truncated package
+        pending = {}
+        curl_config = []
+        for url in result.stdout.split():
+            if not url.startswith(("http://", "https://")):
+                continue
+            target = cache_dir / url.rsplit("/", 1)[-1]
+            if target.exists():
+                continue
+            part = target.with_name(target.name + ".part")
+            pending[str(part)] = target
+            curl_config.append(f'url = "{url}"\noutput = "{part}"\n')
+        
+        if not pending:
+            return 0
+        
+        self._update_progress(f"Downloading {len(pending)} packages...", 10)
+        result = subprocess.run(
+            ["curl", "--parallel", "--parallel-max", str(PREFETCH_PARALLEL),
+             "--fail", "--silent", "--location",
+             "--write-out", "%{exitcode} %{filename_effective}\n",
+             "--config", "-"],
+            input="".join(curl_config),
+            capture_output=True,
+            text=True
+        )
+        
+        fetched = 0
+        for line in result.stdout.splitlines():
+            code, _, part = line.partition(" ")
+            if code == "0" and part in pending:
+                os.replace(part, pending.pop(part))
+                fetched += 1
+        
+        for part in pending:
+            Path(part).unlink(missing_ok=True)
+        
+        return fetched
+    
     def generate_fstab(self) -> bool:
         """Generate fstab file"""
         try:
@@ -93,7 +377,7 @@ class SystemInstaller:
             with open(fstab_path, 'w') as f:
                 f.write(result.stdout)
             
-            logger.info(f"fstab generated: {len(result.stdout.splitlines())} entries")
+            logger.info("fstab generated: %s entries", len(result.stdout.splitlines()))
             self._update_progress("fstab generated successfully", 35)
             return True
             
@@ -107,33 +391,48 @@ class SystemInstaller:
         try:
             self._update_progress("Setting up network configuration...", 40)
             
-            # Copy resolv.conf for DNS resolution
+            # Bind-mount resolv.conf for DNS resolution, so changes the live
+            # system makes to it show up in the target too
             resolv_source = Path("/etc/resolv.conf")
             resolv_target = self.mount_point / "etc" / "resolv.conf"
             
-            if resolv_source.exists():
-                shutil.copy2(resolv_source, resolv_target)
-                logger.info("DNS configuration copied")
+            if resolv_source.exists() and not resolv_target.is_mount():
+                # A bind mount needs an existing file to land on
+                if resolv_target.is_symlink():
+                    resolv_target.unlink()
+                resolv_target.touch()
+                subprocess.run(
+                    ["mount", "--bind", str(resolv_source), str(resolv_target)],
+                    capture_output=True,
+                    text=True,
+                    check=True
+                )
+                self._bind_mounts.append(resolv_target)
+                logger.info("DNS configuration bind-mounted")
             
             # Setup mirror configuration
             if mirror_url:
                 mirrorlist_target = self.mount_point / "etc" / "pacman.d" / "mirrorlist"
                 
                 # Create mirrorlist with selected mirror
-                with open(mirrorlist_target, 'w') as f:
-                    f.write(f"# GamerX Installer - Selected Mirror\n")
-                    f.write(f"Server = {mirror_url}\n")
+                _write_small(mirrorlist_target, f"# GamerX Installer - Selected Mirror\nServer = {mirror_url}\n")
                 
-                logger.info(f"Mirror configured: {mirror_url}")
+                logger.info("Mirror configured: %s", mirror_url)
             else:
                 # Copy current mirrorlist
                 mirrorlist_source = Path("/etc/pacman.d/mirrorlist")
                 mirrorlist_target = self.mount_point / "etc" / "pacman.d" / "mirrorlist"
                 
                 if mirrorlist_source.exists():
-                    shutil.copy2(mirrorlist_source, mirrorlist_target)
+                    _fast_copyfile(mirrorlist_source, mirrorlist_target)
+                    shutil.copystat(mirrorlist_source, mirrorlist_target)
                     logger.info("Current mirrorlist copied")
             
+            # Keep parallel downloads for pacman runs inside the target
+            target_conf = self.mount_point / "etc" / "pacman.conf"
+            if target_conf.exists() and _enable_parallel_downloads(target_conf):
+                logger.info("Parallel downloads enabled in %s", target_conf)
+            
             self._update_progress("Network configuration completed", 45)
             return True
             
@@ -142,10 +441,22 @@ class SystemInstaller:
             logger.error(error_msg)
             raise SystemInstallError(error_msg)
     
-    def copy_installer_files(self) -> bool:
-        """Copy installer and profile files to target system"""
+    def release_bind_mounts(self):
+        """Unmount bind mounts made into the target, newest first"""
+        while self._bind_mounts:
+            target = self._bind_mounts.pop()
+            subprocess.run(["umount", "-q", str(target)], check=False, capture_output=True)
+            logger.info("Released bind mount: %s", target)
+    
+    def copy_installer_files(self, report_progress: bool = True) -> bool:
+        """Copy installer and profile files to target system
+        
+        report_progress=False keeps the copy off the progress bar, for when it
+        runs alongside install_base_system
+        """
         try:
-            self._update_progress("Copying installer files...", 50)
+            if report_progress:
+                self._update_progress("Copying installer files...", 50)
             
             # Source directories in live environment
             installer_source = Path("/usr/local/bin/Installer")
@@ -160,23 +471,22 @@ class SystemInstaller:
             
             # Copy Installer directory
             if installer_source.exists():
-                if installer_target.exists():
-                    shutil.rmtree(installer_target)
-                shutil.copytree(installer_source, installer_target)
-                logger.info(f"Installer directory copied: {installer_source} -> {installer_target}")
+                # Only changed files are copied, so re-runs are nearly free
+                _sync_tree(installer_source, installer_target)
+                logger.info("Installer directory copied: %s -> %s", installer_source, installer_target)
             else:
-                logger.warning(f"Installer source directory not found: {installer_source}")
+                logger.warning("Installer source directory not found: %s", installer_source)
             
             # Copy profiles directory
             if profiles_source.exists():
-                if profiles_target.exists():
-                    shutil.rmtree(profiles_target)
-                shutil.copytree(profiles_source, profiles_target)
-                logger.info(f"Profiles directory copied: {profiles_source} -> {profiles_target}")
+                # Only changed files are copied, so re-runs are nearly free
+                _sync_tree(profiles_source, profiles_target)
+                logger.info("Profiles directory copied: %s -> %s", profiles_source, profiles_target)
             else:
-                logger.warning(f"Profiles source directory not found: {profiles_source}")
+                logger.warning("Profiles source directory not found: %s", profiles_source)
             
-            self._update_progress("Installer files copied successfully", 55)
+            if report_progress:
+                self._update_progress("Installer files copied successfully", 55)
             return True
             
         except Exception as e:
@@ -204,7 +514,7 @@ class SystemInstaller:
                 self._run_chroot_command([
                     "sh", "-c", f"echo '{sudoers_line}' >> /etc/sudoers.d/{username}"
                 ])
-                logger.info(f"Sudo enabled for user: {username}")
+                logger.info("Sudo enabled for user: %s", username)
             
             self._update_progress(f"User {username} created successfully", 65)
             return True
@@ -214,24 +524,20 @@ class SystemInstaller:
             logger.error(error_msg)
             raise SystemInstallError(error_msg)
     
-    def set_hostname(self, hostname: str) -> bool:
-        """Set system hostname"""
+    def write_hostname_files(self, hostname: str) -> bool:
+        """Write /etc/hostname and /etc/hosts; plain file writes, no chroot needed"""
         try:
-            # Set hostname
             hostname_file = self.mount_point / "etc" / "hostname"
-            with open(hostname_file, 'w') as f:
-                f.write(hostname + '\n')
+            _write_small(hostname_file, hostname + '\n')
             
-            # Update hosts file
             hosts_file = self.mount_point / "etc" / "hosts"
             hosts_content = f"""127.0.0.1	localhost
 ::1		localhost
 127.0.1.1	{hostname}.localdomain	{hostname}
 """
-            with open(hosts_file, 'w') as f:
-                f.write(hosts_content)
+            _write_small(hosts_file, hosts_content)
             
-            logger.info(f"Hostname set: {hostname}")
+            logger.info("Hostname set: %s", hostname)
             return True
             
         except Exception as e:
@@ -239,34 +545,82 @@ class SystemInstaller:
             logger.error(error_msg)
             raise SystemInstallError(error_msg)
     
-    def configure_locale(self, locale: str = "en_US.UTF-8") -> bool:
-        """Configure system locale"""
+    def write_locale_files(self, locale: str = "en_US.UTF-8") -> bool:
+        """
+        Enable the locale in /etc/locale.gen and write /etc/locale.conf
+        locale-gen still has to run in the chroot afterwards
+        """
         try:
-            self._update_progress("Configuring locale...", 70)
-            
-            # Enable locale in locale.gen
             locale_gen_file = self.mount_point / "etc" / "locale.gen"
+            content = _read_small(locale_gen_file)
             
-            # Read current locale.gen
-            with open(locale_gen_file, 'r') as f:
-                content = f.read()
+            # Uncomment the line for exactly this locale, e.g. "#en_US.UTF-8 UTF-8"
+            pattern = self._locale_patterns.get(locale)
+            if pattern is None:
+                pattern = re.compile(rf'^#\s*({re.escape(locale)}\s+\S+)\s*$', re.M)
+                self._locale_patterns[locale] = pattern
+            updated = pattern.sub(r'\1', content, count=1)
             
-            # Uncomment the desired locale
-            content = content.replace(f"#{locale}", locale)
+            # Write back only if something changed
+            if updated != content:
+                _write_small(locale_gen_file, updated)
             
-            # Write back
-            with open(locale_gen_file, 'w') as f:
-                f.write(content)
+            locale_conf_file = self.mount_point / "etc" / "locale.conf"
+            _write_small(locale_conf_file, f"LANG={locale}\n")
+            return True
             
-            # Generate locale
-            self._run_chroot_command(["locale-gen"])
+        except Exception as e:
+            error_msg = f"Locale configuration failed: {e}"
+            logger.error(error_msg)
+            raise SystemInstallError(error_msg)
+    
+    def configure_system(self, timezone: str = "UTC", services: List[str] = ESSENTIAL_SERVICES) -> bool:
+        """
+        Generate locales, set the timezone and enable services in a single chroot session
+        Every arch-chroot call mounts and tears down /proc, /sys and /dev, so
+        the steps are batched into one script instead of one call each.
+        Run write_hostname_files and write_locale_files first
+        """
+        try:
+            self._update_progress("Configuring system...", 70)
             
-            # Set locale.conf
-            locale_conf_file = self.mount_point / "etc" / "locale.conf"
-            with open(locale_conf_file, 'w') as f:
-                f.write(f"LANG={locale}\n")
+            script = "\n".join([
+                "set -e",
+                "locale-gen",
+                f"ln -sf {shlex.quote(f'/usr/share/zoneinfo/{timezone}')} /etc/localtime",
+                "hwclock --systohc",
+                "systemctl enable " + " ".join(shlex.quote(unit) for unit in services),
+            ]) + "\n"
+            
+            self._run_chroot_script(script, capture_stdout=False)
+            
+            logger.info("System configured: timezone=%s, services=%s", timezone, ', '.join(services))
+            self._update_progress("System configured successfully", 75)
+            return True
             
-            logger.info(f"Locale configured: {locale}")
+        except Exception as e:
+            error_msg = f"System configuration failed: {e}"
+            logger.error(error_msg)
+            raise SystemInstallError(error_msg)
+    
+    def set_hostname(self, hostname: str) -> bool:
+        """Set system hostname (deprecated, use write_hostname_files)"""
+        warnings.warn("set_hostname is deprecated, use write_hostname_files", DeprecationWarning, stacklevel=2)
+        return self.write_hostname_files(hostname)
+    
+    def configure_locale(self, locale: str = "en_US.UTF-8") -> bool:
+        """Configure system locale (deprecated, use write_locale_files and configure_system)"""
+        warnings.warn("configure_locale is deprecated, use write_locale_files and configure_system",
+                      DeprecationWarning, stacklevel=2)
+        try:
+            self._update_progress("Configuring locale...", 70)
+            
+            self.write_locale_files(locale)
+            
+            # Generate locale
+            self._run_chroot_command(["locale-gen"], capture_stdout=False)
+            
+            logger.info("Locale configured: %s", locale)
             self._update_progress("Locale configured successfully", 75)
             return True
             
@@ -276,17 +630,18 @@ class SystemInstaller:
             raise SystemInstallError(error_msg)
     
     def configure_timezone(self, timezone: str = "UTC") -> bool:
-        """Configure system timezone"""
+        """Configure system timezone (deprecated, use configure_system)"""
+        warnings.warn("configure_timezone is deprecated, use configure_system", DeprecationWarning, stacklevel=2)
         try:
             # Set timezone
             self._run_chroot_command([
                 "ln", "-sf", f"/usr/share/zoneinfo/{timezone}", "/etc/localtime"
-            ])
+            ], capture_stdout=False)
             
             # Set hardware clock
-            self._run_chroot_command(["hwclock", "--systohc"])
+            self._run_chroot_command(["hwclock", "--systohc"], capture_stdout=False)
             
-            logger.info(f"Timezone configured: {timezone}")
+            logger.info("Timezone configured: %s", timezone)
             return True
             
         except Exception as e:
@@ -303,10 +658,10 @@ class SystemInstaller:
             self._run_chroot_command([
                 "grub-install", "--target=x86_64-efi", "--efi-directory=/boot/efi", 
                 "--bootloader-id=GRUB", "--removable"
-            ])
+            ], capture_stdout=False)
             
             # Generate GRUB configuration
-            self._run_chroot_command(["grub-mkconfig", "-o", "/boot/grub/grub.cfg"])
+            self._run_chroot_command(["grub-mkconfig", "-o", "/boot/grub/grub.cfg"], capture_stdout=False)
             
             logger.info("GRUB bootloader installed successfully")
             self._update_progress("Bootloader installed successfully", 85)
@@ -317,14 +672,16 @@ class SystemInstaller:
             logger.error(error_msg)
             raise SystemInstallError(error_msg)
     
-    def enable_services(self) -> bool:
-        """Enable essential system services"""
+    def enable_services(self, units: List[str] = ESSENTIAL_SERVICES) -> bool:
+        """Enable system services with a single systemctl call (deprecated, use configure_system)"""
+        warnings.warn("enable_services is deprecated, use configure_system", DeprecationWarning, stacklevel=2)
         try:
-            services = ["NetworkManager", "systemd-timesyncd"]
+            units = list(units)
+            if not units:
+                return True
             
-            for service in services:
-                self._run_chroot_command(["systemctl", "enable", service])
-                logger.info(f"Service enabled: {service}")
+            self._run_chroot_command(["systemctl", "enable", *units], capture_stdout=False)
+            logger.info("Services enabled: %s", ', '.join(units))
             
             return True
             
@@ -333,22 +690,84 @@ class SystemInstaller:
             logger.error(error_msg)
             raise SystemInstallError(error_msg)
     
-    def _run_chroot_command(self, command: List[str], input_data: str = None) -> subprocess.CompletedProcess:
-        """Run command in chroot environment"""
+    def _run_chroot_command(self, command: List[str], input_data: str = None, *,
+                            capture_stdout: bool = True) -> subprocess.CompletedProcess:
+        """
+        Run command in chroot environment
+        Pass capture_stdout=False for chatty commands whose output is unused;
+        stdout then goes to /dev/null and only stderr is kept for errors
+        """
         chroot_cmd = ["arch-chroot", str(self.mount_point)] + command
         
-        logger.debug(f"Running chroot command: {' '.join(chroot_cmd)}")
+        logger.debug("Running chroot command: %s", chroot_cmd)
         
         result = subprocess.run(
             chroot_cmd,
             input=input_data,
             text=True,
-            capture_output=True,
+            stdout=subprocess.PIPE if capture_stdout else subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
             check=True
         )
         
         return result
     
+    def _run_chroot_script(self, script: str, *, capture_stdout: bool = True) -> subprocess.CompletedProcess:
+        """Run a shell script in one chroot session, fed to bash on stdin"""
+        return self._run_chroot_command(["bash", "-s"], input_data=script, capture_stdout=capture_stdout)
+    
+    def _run_streaming(self, cmd: List[str], start: int, end: int) -> str:
+        """
+        Run a pacman style command, reading its output a line at a time and
+        turning the per-package lines into progress between start and end
+        Raises TimeoutExpired if the command prints nothing for STALL_TIMEOUT
+        seconds, and CalledProcessError carrying the last lines of output on failure
+        """
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1
+        )
+        last_output = time.monotonic()
+        finished = threading.Event()
+        stalled = threading.Event()
+        
+        def watchdog():
+            while not finished.wait(WATCHDOG_INTERVAL):
+                if time.monotonic() - last_output > STALL_TIMEOUT:
+                    stalled.set()
+                    process.kill()
+                    return
+        
+        threading.Thread(target=watchdog, daemon=True).start()
+        tail = deque(maxlen=OUTPUT_TAIL_LINES)
+        try:
+            for line in process.stdout:
+                last_output = time.monotonic()
+                tail.append(line)
+                match = INSTALL_PROGRESS_RE.match(line)
+                if match:
+                    done, total, package = match.groups()
+                    self._update_progress(
+                        f"Installing {package} ({done}/{total})",
+                        start + (end - start) * int(done) // int(total)
+                    )
+            returncode = process.wait()
+        finally:
+            finished.set()
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+        
+        output = "".join(tail)
+        if stalled.is_set():
+            raise subprocess.TimeoutExpired(cmd, STALL_TIMEOUT, output=output)
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, cmd, output=output)
+        return output
+    
     def install_packages(self, packages: List[str]) -> bool:
         """Install additional packages in chroot"""
         try:
@@ -357,14 +776,17 @@ class SystemInstaller:
                 
             self._update_progress(f"Installing {len(packages)} additional packages...", 90)
             
-            # Update package database first
-            self._run_chroot_command(["pacman", "-Sy"])
+            # Update package database first, unless pacstrap synced it recently
+            if self._db_synced_at is None or time.monotonic() - self._db_synced_at > DB_SYNC_MAX_AGE:
+                self._run_chroot_command(["pacman", "-Sy"], capture_stdout=False)
+                self._db_synced_at = time.monotonic()
             
-            # Install packages
-            cmd = ["pacman", "-S", "--noconfirm"] + packages
-            self._run_chroot_command(cmd)
+            # Install packages, streaming pacman's output as progress;
+            # --needed skips anything pacstrap already installed
+            cmd = ["arch-chroot", str(self.mount_point), "pacman", "-S", "--noconfirm", "--needed"] + packages
+            self._run_streaming(cmd, 90, 95)
             
-            logger.info(f"Additional packages installed: {' '.join(packages)}")
+            logger.info("Additional packages installed: %s", ' '.join(packages))
             self._update_progress("Additional packages installed", 95)
             return True
             
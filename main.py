@@ -9,11 +9,18 @@ import os
 import asyncio
 from pathlib import Path
 
+# uvloop is optional; when installed it replaces the default asyncio event loop
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
 # Add the project root to Python path
 PROJECT_ROOT = Path(__file__).parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
 from ui.app import GamerXApp
+from ui.base import REBOOT_ON_EXIT
 from utils.logging import setup_logging
 from config.settings import VERSION, APP_NAME, THEME_COLORS
 
@@ -45,14 +52,25 @@ async def main():
     
     # Create and run the TUI application
     app = GamerXApp()
-    await app.run_async()
+    return await app.run_async()
 
 if __name__ == "__main__":
+    if uvloop is not None:
+        uvloop.install()
+    
     try:
-        asyncio.run(main())
+        result = asyncio.run(main())
     except KeyboardInterrupt:
         print("\n👋 Installation cancelled by user")
         sys.exit(0)
     except Exception as e:
         print(f"💥 Fatal error: {e}")
         sys.exit(1)
+    
+    # Exec rather than fork: the installer has nothing left to do once reboot starts
+    if result == REBOOT_ON_EXIT:
+        try:
+            os.execvp("reboot", ["reboot"])
+        except OSError as e:
+            print(f"❌ Failed to reboot: {e}")
+            sys.exit(1)
@@ -8,94 +8,127 @@ from textual.containers import Container
 from textual.widgets import Header, Footer
 from textual.screen import Screen
 from textual.binding import Binding
-from typing import Dict, Any, Optional
+from dataclasses import fields
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional
+from string import Template
 import asyncio
+import importlib
+import pprint
 
 from utils.logging import get_logger
 from config.settings import CONFIG, THEME_COLORS
 from ui.screens.welcome import WelcomeScreen
-from ui.screens.disk import DiskSelectionScreen
-from ui.screens.hostname import HostnameScreen
-from ui.screens.user import UserScreen
-from ui.screens.locale import LocaleScreen
-from ui.screens.timezone import TimezoneScreen
-from ui.screens.kernel import KernelScreen
-from ui.screens.swap import SwapScreen
-from ui.screens.mirror import MirrorScreen
-from ui.screens.packages import PackagesScreen
-from ui.screens.profiles import ProfilesScreen
-from ui.screens.summary import SummaryScreen
-from ui.screens.install import InstallScreen
 
 logger = get_logger(__name__)
 
+# Theme stylesheet; ${name} placeholders are filled from THEME_COLORS once, at import
+_CSS_TEMPLATE = """
+Screen {
+    background: ${background};
+}
+
+.title {
+    color: ${primary};
+    text-style: bold;
+}
+
+.subtitle {
+    color: ${secondary};
+}
+
+.success {
+    color: ${success};
+}
+
+.warning {
+    color: ${warning};
+}
+
+.error {
+    color: ${error};
+}
+
+.highlight {
+    background: ${highlight};
+    color: ${background};
+}
+
+Button {
+    margin: 1;
+}
+
+Button.-primary {
+    background: ${primary};
+    color: ${background};
+}
+
+Button.-secondary {
+    background: ${secondary};
+    color: ${background};
+}
+
+Input {
+    margin: 1;
+}
+
+Select {
+    margin: 1;
+}
+
+.container {
+    padding: 1;
+    margin: 1;
+    border: solid ${secondary};
+}
+
+.progress {
+    color: ${success};
+    text-style: bold;
+}
+"""
+_THEME_CSS = Template(_CSS_TEMPLATE).substitute(THEME_COLORS)
+
+# validate_config tables: fields that must be set, and (field, min, max, message)
+# length rules where a max of None means unbounded
+_REQUIRED_FIELDS = ('disk', 'hostname', 'username', 'password')
+_LENGTH_RULES = (
+    ('hostname', 2, 63, "Hostname must be 2-63 characters"),
+    ('username', 2, 32, "Username must be 2-32 characters"),
+    ('password', 6, None, "Password must be at least 6 characters"),
+)
+
+# Fields read by validate_config and get_installation_summary; their
+# values key the memoized results
+_VALIDATED_FIELDS = tuple(dict.fromkeys(_REQUIRED_FIELDS + tuple(rule[0] for rule in _LENGTH_RULES)))
+_SUMMARY_FIELDS = (
+    'disk', 'hostname', 'username', 'kernel', 'swap_size', 'language', 'locale',
+    'timezone', 'mirror_country', 'mirror_url', 'profiles', 'additional_packages'
+)
+
+def _freeze(value: Any) -> Any:
+    """Turn list and dict config values into hashable tuples"""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+# Screen classes already imported by GamerXApp._load_screen
+_screen_cache: Dict[str, type] = {'welcome': WelcomeScreen}
+
+# show_message types mapped to Textual notification severities
+_SEVERITY_MAP = {
+    "info": "information",
+    "success": "information",
+    "warning": "warning",
+    "error": "error"
+}
+
 class GamerXApp(App):
     """Main GamerX installer application"""
     
-    CSS = f"""
-    Screen {{
-        background: {THEME_COLORS['background']};
-    }}
-    
-    .title {{
-        color: {THEME_COLORS['primary']};
-        text-style: bold;
-    }}
-    
-    .subtitle {{
-        color: {THEME_COLORS['secondary']};
-    }}
-    
-    .success {{
-        color: {THEME_COLORS['success']};
-    }}
-    
-    .warning {{
-        color: {THEME_COLORS['warning']};
-    }}
-    
-    .error {{
-        color: {THEME_COLORS['error']};
-    }}
-    
-    .highlight {{
-        background: {THEME_COLORS['highlight']};
-        color: {THEME_COLORS['background']};
-    }}
-    
-    Button {{
-        margin: 1;
-    }}
-    
-    Button.-primary {{
-        background: {THEME_COLORS['primary']};
-        color: {THEME_COLORS['background']};
-    }}
-    
-    Button.-secondary {{
-        background: {THEME_COLORS['secondary']};
-        color: {THEME_COLORS['background']};
-    }}
-    
-    Input {{
-        margin: 1;
-    }}
-    
-    Select {{
-        margin: 1;
-    }}
-    
-    .container {{
-        padding: 1;
-        margin: 1;
-        border: solid {THEME_COLORS['secondary']};
-    }}
-    
-    .progress {{
-        color: {THEME_COLORS['success']};
-        text-style: bold;
-    }}
-    """
+    CSS = _THEME_CSS
     
     TITLE = "GamerX Linux Installer"
     SUB_TITLE = "Modular Arch Linux Installation System"
@@ -107,10 +140,29 @@ class GamerXApp(App):
         ("f10", "debug", "Debug"),
     ]
     
+    # Screens are imported on first navigation, only the welcome screen is needed at startup
+    SCREEN_MAP = {
+        'welcome': ('ui.screens.welcome', 'WelcomeScreen'),
+        'disk': ('ui.screens.disk', 'DiskSelectionScreen'),
+        'hostname': ('ui.screens.hostname', 'HostnameScreen'),
+        'user': ('ui.screens.user', 'UserScreen'),
+        'locale': ('ui.screens.locale', 'LocaleScreen'),
+        'timezone': ('ui.screens.timezone', 'TimezoneScreen'),
+        'kernel': ('ui.screens.kernel', 'KernelScreen'),
+        'swap': ('ui.screens.swap', 'SwapScreen'),
+        'mirror': ('ui.screens.mirror', 'MirrorScreen'),
+        'packages': ('ui.screens.packages', 'PackagesScreen'),
+        'profiles': ('ui.screens.profiles', 'ProfilesScreen'),
+        'summary': ('ui.screens.summary', 'SummaryScreen'),
+        'install': ('ui.screens.install', 'InstallScreen'),
+    }
+    
     def __init__(self):
         super().__init__()
         self.config = CONFIG.copy()
-
+        # Last (config key, result) pair for validate_config and get_installation_summary
+        self._validate_memo: Optional[tuple] = None
+        self._summary_memo: Optional[tuple] = None
         
     def compose(self) -> ComposeResult:
         """Compose the main app layout"""
@@ -136,37 +188,30 @@ class GamerXApp(App):
     
     def action_debug(self) -> None:
         """Show debug information"""
-        debug_info = f"""
-Configuration:
-{self.config}
-
-Active Screens: {len(self.screen_stack)}
-"""
+        # Depth-limited pformat keeps the profile and package lists from flooding the notification
+        config = {f.name: getattr(self.config, f.name) for f in fields(self.config) if f.repr}
+        debug_info = (
+            f"Configuration:\n{pprint.pformat(config, compact=True, depth=2, width=100)}\n\n"
+            f"Screen Stack: {len(self.screen_stack)}"
+        )
         self.notify(debug_info, title="Debug Info", timeout=10)
     
+    def _load_screen(self, screen_name: str) -> Optional[type]:
+        """Resolve a screen name to its class, importing the module on first use"""
+        screen_class = _screen_cache.get(screen_name)
+        if screen_class is None and screen_name in self.SCREEN_MAP:
+            module_path, class_name = self.SCREEN_MAP[screen_name]
+            screen_class = getattr(importlib.import_module(module_path), class_name)
+            _screen_cache[screen_name] = screen_class
+        return screen_class
+    
     async def navigate_to_screen(self, screen_name: str) -> None:
         """Navigate to a specific screen"""
-        screen_map = {
-            'welcome': WelcomeScreen,
-            'disk': DiskSelectionScreen,
-            'hostname': HostnameScreen,
-            'user': UserScreen,
-            'locale': LocaleScreen,
-            'timezone': TimezoneScreen,
-            'kernel': KernelScreen,
-            'swap': SwapScreen,
-            'mirror': MirrorScreen,
-            'packages': PackagesScreen,
-            'profiles': ProfilesScreen,
-            'summary': SummaryScreen,
-            'install': InstallScreen,
-        }
-        
-        if screen_name in screen_map:
-            screen_class = screen_map[screen_name]
+        screen_class = self._load_screen(screen_name)
+        if screen_class:
             await self.push_screen(screen_class(self.config))
         else:
-            logger.error(f"Unknown screen: {screen_name}")
+            logger.error("Unknown screen: %s", screen_name)
             self.notify(f"Unknown screen: {screen_name}", severity="error")
     
     async def go_back(self) -> None:
@@ -179,98 +224,112 @@ Active Screens: {len(self.screen_stack)}
     def update_config(self, key: str, value: Any) -> None:
         """Update configuration value"""
         self.config[key] = value
-        logger.debug(f"Config updated: {key} = {value}")
-    
-    def get_config(self, key: str, default: Any = None) -> Any:
-        """Get configuration value"""
+        if key in _VALIDATED_FIELDS:
+            self._validate_memo = None
+        if key in _SUMMARY_FIELDS:
+            self._summary_memo = None
+        logger.debug("Config updated: %s = %r", key, value)
+    
+    def get_config(self, key: Optional[str] = None, default: Any = None) -> Any:
+        """Get configuration value, or the whole configuration when no key is given"""
+        if key is None:
+            return self.config
         return self.config.get(key, default)
     
+    def _config_key(self, fields: tuple) -> tuple:
+        """Hashable snapshot of the given config fields, lists turned into tuples"""
+        return tuple(_freeze(getattr(self.config, field)) for field in fields)
+    
+    def is_config_valid(self) -> bool:
+        """Quick pass/fail check that stops at the first problem; use validate_config for the messages"""
+        config = self.config
+        if any(not getattr(config, field) for field in _REQUIRED_FIELDS):
+            return False
+        for field, min_len, max_len, _ in _LENGTH_RULES:
+            value = getattr(config, field)
+            if value and (len(value) < min_len or (max_len and len(value) > max_len)):
+                return False
+        return True
+    
     def validate_config(self) -> tuple[bool, list[str]]:
-        """Validate current configuration"""
-        errors = []
+        """Validate current configuration, reusing the last result while the fields are unchanged"""
+        key = self._config_key(_VALIDATED_FIELDS)
+        if self._validate_memo is not None and self._validate_memo[0] == key:
+            valid, errors = self._validate_memo[1]
+            return valid, list(errors)
         
         # Required fields
-        required = ['disk', 'hostname', 'username', 'password']
-        for field in required:
-            if not self.config.get(field):
-                errors.append(f"Missing {field}")
-        
-        # Validation rules
-        if self.config.get('hostname'):
-            hostname = self.config['hostname']
-            if len(hostname) < 2 or len(hostname) > 63:
-                errors.append("Hostname must be 2-63 characters")
+        errors = [f"Missing {field}" for field in _REQUIRED_FIELDS if not getattr(self.config, field)]
         
-        if self.config.get('username'):
-            username = self.config['username']
-            if len(username) < 2 or len(username) > 32:
-                errors.append("Username must be 2-32 characters")
-        
-        if self.config.get('password'):
-            password = self.config['password']
-            if len(password) < 6:
-                errors.append("Password must be at least 6 characters")
+        # Length rules, checked only for fields that are set
+        for field, min_len, max_len, message in _LENGTH_RULES:
+            value = getattr(self.config, field)
+            if value and (len(value) < min_len or (max_len and len(value) > max_len)):
+                errors.append(message)
         
+        self._validate_memo = (key, (len(errors) == 0, tuple(errors)))
         return len(errors) == 0, errors
     
-    def get_installation_summary(self) -> Dict[str, Any]:
-        """Get formatted installation summary"""
-        return {
+    def get_installation_summary(self) -> Mapping[str, Any]:
+        """Get formatted installation summary, rebuilt only when a summarized field changed"""
+        key = self._config_key(_SUMMARY_FIELDS)
+        if self._summary_memo is not None and self._summary_memo[0] == key:
+            return self._summary_memo[1]
+        
+        config = self.config
+        summary = MappingProxyType({
             'System': {
-                'Disk': self.config.get('disk', 'Not selected'),
-                'Hostname': self.config.get('hostname', 'Not set'),
-                'Username': self.config.get('username', 'Not set'),
-                'Kernel': self.config.get('kernel', 'linux'),
-                'Swap': self.config.get('swap_size', '0'),
+                'Disk': config.disk or 'Not selected',
+                'Hostname': config.hostname or 'Not set',
+                'Username': config.username or 'Not set',
+                'Kernel': config.kernel,
+                'Swap': config.swap_size,
             },
             'Localization': {
-                'Language': self.config.get('language', 'English (US)'),
-                'Locale': self.config.get('locale', 'en_US.UTF-8'),
-                'Timezone': self.config.get('timezone', 'UTC'),
+                'Language': config.language,
+                'Locale': config.locale,
+                'Timezone': config.timezone,
             },
             'Network': {
-                'Mirror': self.config.get('mirror_country', 'Auto'),
-                'Mirror URL': self.config.get('mirror_url', 'Auto-selected'),
+                'Mirror': config.mirror_country or 'Auto',
+                'Mirror URL': config.mirror_url or 'Auto-selected',
             },
             'Software': {
-                'Profiles': self.config.get('profiles', []),
-                'Additional Packages': self.config.get('additional_packages', []),
+                'Profiles': config.profiles,
+                'Additional Packages': config.additional_packages,
             }
-        }
+        })
+        self._summary_memo = (key, summary)
+        return summary
     
-    async def show_error(self, message: str, title: str = "Error") -> None:
+    def show_error(self, message: str, title: str = "Error") -> None:
         """Show error message"""
-        logger.error(f"{title}: {message}")
+        logger.error("%s: %s", title, message)
         self.notify(message, title=title, severity="error", timeout=10)
     
-    async def show_success(self, message: str, title: str = "Success") -> None:
+    def show_success(self, message: str, title: str = "Success") -> None:
         """Show success message"""
-        logger.info(f"{title}: {message}")
+        logger.info("%s: %s", title, message)
         self.notify(message, title=title, severity="information", timeout=5)
     
-    async def show_message(self, message: str, message_type: str = "info") -> None:
+    def show_message(self, message: str, message_type: str = "info") -> None:
         """Show message with different types"""
-        severity_map = {
-            "info": "information",
-            "success": "information", 
-            "warning": "warning",
-            "error": "error"
-        }
-        severity = severity_map.get(message_type, "information")
-        logger.info(f"Message ({message_type}): {message}")
+        severity = _SEVERITY_MAP.get(message_type, "information")
+        logger.info("Message (%s): %s", message_type, message)
         self.notify(message, severity=severity, timeout=5)
     
     async def show_confirmation(self, message: str, title: str = "Confirm") -> bool:
         """Show confirmation dialog - simplified version"""
-        logger.info(f"Confirmation requested: {title} - {message}")
+        logger.info("Confirmation requested: %s - %s", title, message)
         # For now, just show a notification and return True
-        # In a real implementation, this would show a modal dialog
+        # In a real implementation, this would show a modal dialog,
+        # which is why this one stays async while the other show_* helpers don't
         self.notify(f"{title}: {message}", severity="warning", timeout=10)
         return True
     
-    async def show_warning(self, message: str, title: str = "Warning") -> None:
+    def show_warning(self, message: str, title: str = "Warning") -> None:
         """Show warning message"""
-        logger.warning(f"{title}: {message}")
+        logger.warning("%s: %s", title, message)
         self.notify(message, title=title, severity="warning", timeout=8)
 
 
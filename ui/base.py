@@ -7,18 +7,34 @@ from textual.widgets import Button, Static
 from textual.containers import Horizontal, Vertical
 from typing import Dict, Any, Optional
 import asyncio
+import importlib
+import logging
+import sys
 
 from utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# App exit result asking main.py to exec reboot once the terminal is restored
+REBOOT_ON_EXIT = "reboot"
+
 class BaseInstallerScreen(Screen):
     """Base class for all installer screens"""
     
-    def __init__(self, name: str = None, id: str = None, classes: str = None):
+    # Per-class logger, named after the screen class; subclasses get theirs in __init_subclass__
+    logger = get_logger("BaseInstallerScreen")
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.logger = get_logger(cls.__name__)
+    
+    def __init__(self, config: Any = None, name: str = None, id: str = None, classes: str = None):
         super().__init__(name, id, classes)
+        # The app's shared InstallerConfig; screens pushed without one read it from the app
+        self.config = config
         self.installer_data: Dict[str, Any] = {}
-        self.logger = get_logger(self.__class__.__name__)
+        # The app's installer_data dict, bound once the screen is mounted
+        self._installer_data: Optional[Dict[str, Any]] = None
     
     def compose(self):
         """Override in subclasses"""
@@ -26,18 +42,28 @@ class BaseInstallerScreen(Screen):
     
     def on_mount(self):
         """Called when screen is mounted"""
-        self.logger.info(f"Mounted {self.__class__.__name__}")
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info("Mounted %s", self.__class__.__name__)
+        self._installer_data = getattr(self.app, 'installer_data', None)
+    
+    def get_config(self, key: str, default: Any = None) -> Any:
+        """Get a configuration value from the app"""
+        return self.app.get_config(key, default)
+    
+    def update_config(self, key: str, value: Any):
+        """Update a configuration value on the app"""
+        self.app.update_config(key, value)
     
     def get_installer_data(self) -> Dict[str, Any]:
         """Get installer data from app"""
-        if hasattr(self.app, 'installer_data'):
-            return self.app.installer_data
+        if self._installer_data is not None:
+            return self._installer_data
         return {}
     
     def set_installer_data(self, key: str, value: Any):
         """Set installer data in app"""
-        if hasattr(self.app, 'installer_data'):
-            self.app.installer_data[key] = value
+        if self._installer_data is not None:
+            self._installer_data[key] = value
     
     def create_navigation_buttons(self, show_back: bool = True, show_next: bool = True, 
                                 next_text: str = "Next", next_action: str = "next"):
@@ -70,20 +96,28 @@ class BaseInstallerScreen(Screen):
         """Handle next button - override in subclasses"""
         pass
     
-    async def show_error(self, message: str):
+    def show_error(self, message: str):
         """Show error message"""
         self.logger.error(message)
-        await self.app.show_message(message, "error")
+        self.app.show_message(message, "error")
     
-    async def show_success(self, message: str):
+    def show_success(self, message: str):
         """Show success message"""
         self.logger.info(message)
-        await self.app.show_message(message, "success")
+        self.app.show_message(message, "success")
     
-    async def show_warning(self, message: str):
+    def show_warning(self, message: str):
         """Show warning message"""
         self.logger.warning(message)
-        await self.app.show_message(message, "warning")
+        self.app.show_message(message, "warning")
+    
+    def prefetch_screen(self, module_path: str) -> None:
+        """Import the next screen's module in a worker thread, so Continue finds it in sys.modules"""
+        if module_path in sys.modules:
+            return
+        self._prefetch_task = asyncio.create_task(asyncio.to_thread(importlib.import_module, module_path))
+        # A failed prefetch is left for the real import in the Continue handler to report
+        self._prefetch_task.add_done_callback(lambda task: task.cancelled() or task.exception())
     
     async def go_back(self):
         """Go back to previous screen"""
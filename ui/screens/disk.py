@@ -8,6 +8,7 @@ from textual.containers import Container, Vertical, Horizontal
 from textual.widgets import Static, Button, Select, DataTable
 from textual.binding import Binding
 import asyncio
+from typing import Dict, Optional
 
 from ui.base import BaseInstallerScreen
 from core.disk import DiskManager
@@ -15,6 +16,23 @@ from utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Smallest disk installed to without a warning
+MIN_DISK_GB = 20
+
+# Seconds a row must stay selected before its details are loaded
+SELECT_THROTTLE = 0.1
+
+# Header of the disk details panel; partition lines are appended after it
+_DETAIL_TEMPLATE = """Selected Disk: {device}
+Size: {size}
+Model: {model}
+Type: {type}
+Filesystem: {fstype}
+Mount Point: {mountpoint}
+
+Partition Layout:
+"""
+
 class DiskSelectionScreen(BaseInstallerScreen):
     """Disk selection screen"""
     
@@ -29,6 +47,12 @@ class DiskSelectionScreen(BaseInstallerScreen):
         self.disk_manager = DiskManager()
         self.selected_disk = None
         self.disks = []
+        # Held while a rescan runs, so repeated refreshes don't stack lsblk calls
+        self._refreshing = asyncio.Lock()
+        # get_disk_info results by device, dropped on every rescan
+        self._info_cache: Dict[str, Dict] = {}
+        # Pending details update for the latest row selection
+        self._last_select_task: Optional[asyncio.Task] = None
     
     def compose(self) -> ComposeResult:
         """Compose the disk selection screen"""
@@ -54,33 +78,53 @@ class DiskSelectionScreen(BaseInstallerScreen):
     def on_mount(self) -> None:
         """Initialize disk table on mount"""
         super().on_mount()
+        # Look the widgets up once; they live as long as the screen
+        self._table = self.query_one("#disk-table", DataTable)
+        self._details = self.query_one("#disk-details", Static)
+        self._continue_btn = self.query_one("#continue-btn", Button)
         self.call_after_refresh(self.refresh_disks)
     
-    async def refresh_disks(self) -> None:
-        """Refresh disk list"""
+    async def refresh_disks(self, force: bool = False) -> bool:
+        """
+        Refresh disk list; force=True rescans even if the last lsblk snapshot is fresh
+        Returns False when a rescan was already running or the rescan failed
+        """
+        if self._refreshing.locked():
+            return False
+        async with self._refreshing:
+            return await self._refresh_disks(force)
+    
+    async def _refresh_disks(self, force: bool) -> bool:
+        """Rescan disks and rebuild the table"""
+        self._info_cache.clear()
         try:
-            table = self.query_one("#disk-table", DataTable)
-            table.clear(columns=True)
-            
-            # Setup table columns
-            table.add_columns("Device", "Size", "Model", "Type", "Status")
-            
-            # Get disk information
-            self.disks = self.disk_manager.list_disks()
+            table = self._table
             
-            if not self.disks:
-                await self.show_error("No suitable disks found for installation")
-                return
-            
-            # Populate table
+            # Get disk information; lsblk runs in a worker thread so the UI keeps drawing
+            self.disks = await asyncio.to_thread(self.disk_manager.list_disks, force)
             for disk in self.disks:
-                table.add_row(
+                disk['size_gb'] = disk.get('size_bytes', 0) / 1024**3
+            
+            rows = [
+                (
                     disk['device'],
                     disk['size'],
                     disk.get('model', 'Unknown'),
                     disk.get('type', 'Unknown'),
                     "Available" if disk.get('mountpoint') is None else "Mounted"
                 )
+                for disk in self.disks
+            ]
+            
+            # Rebuild the table in one repaint rather than one per row
+            with self.app.batch_update():
+                table.clear(columns=True)
+                table.add_columns("Device", "Size", "Model", "Type", "Status")
+                table.add_rows(rows)
+            
+            if not self.disks:
+                self.show_error("No suitable disks found for installation")
+                return False
             
             # Restore selection if previously selected
             if self.get_config('disk'):
@@ -91,11 +135,13 @@ class DiskSelectionScreen(BaseInstallerScreen):
                         await self.update_disk_details(disk)
                         break
             
-            logger.info(f"Found {len(self.disks)} disks")
+            logger.info("Found %s disks", len(self.disks))
+            return True
             
         except Exception as e:
-            logger.error(f"Failed to refresh disks: {e}")
-            await self.show_error(f"Failed to refresh disks: {e}")
+            logger.error("Failed to refresh disks: %s", e)
+            self.show_error(f"Failed to refresh disks: {e}")
+            return False
     
     async def on_data_table_row_selected(self, event: DataTable.RowSelected) -> None:
         """Handle disk selection"""
@@ -103,50 +149,63 @@ class DiskSelectionScreen(BaseInstallerScreen):
             if event.row_index < len(self.disks):
                 selected_disk = self.disks[event.row_index]
                 self.selected_disk = selected_disk
-                await self.update_disk_details(selected_disk)
+                
+                # Only the last row of a held arrow key gets its details loaded
+                if self._last_select_task and not self._last_select_task.done():
+                    self._last_select_task.cancel()
+                self._last_select_task = asyncio.create_task(self._deferred_update(selected_disk))
                 
                 # Enable continue button
-                self.query_one("#continue-btn", Button).disabled = False
+                self._continue_btn.disabled = False
                 
                 # Update config
                 self.update_config('disk', selected_disk['device'])
                 
         except Exception as e:
-            logger.error(f"Error selecting disk: {e}")
-            await self.show_error(f"Error selecting disk: {e}")
+            logger.error("Error selecting disk: %s", e)
+            self.show_error(f"Error selecting disk: {e}")
+    
+    async def _deferred_update(self, disk: Dict) -> None:
+        """Show the details of disk after SELECT_THROTTLE seconds without another selection"""
+        await asyncio.sleep(SELECT_THROTTLE)
+        if self._last_select_task is asyncio.current_task():
+            await self.update_disk_details(disk)
     
     async def update_disk_details(self, disk):
         """Update disk details display"""
         try:
-            details = self.query_one("#disk-details", Static)
+            details = self._details
             
             # Get detailed disk information
-            disk_info = self.disk_manager.get_disk_info(disk['device'])
+            disk_info = self._info_cache.get(disk['device'])
+            if disk_info is None:
+                disk_info = await asyncio.to_thread(self.disk_manager.get_disk_info, disk['device'])
+                self._info_cache[disk['device']] = disk_info
             
-            detail_text = f"""Selected Disk: {disk['device']}
-Size: {disk['size']}
-Model: {disk.get('model', 'Unknown')}
-Type: {disk.get('type', 'Unknown')}
-Filesystem: {disk_info.get('fstype', 'None')}
-Mount Point: {disk_info.get('mountpoint', 'Not mounted')}
-
-Partition Layout:
-"""
+            parts = [_DETAIL_TEMPLATE.format_map({
+                'model': 'Unknown',
+                'type': 'Unknown',
+                **disk,
+                'fstype': disk_info.get('fstype', 'None'),
+                'mountpoint': disk_info.get('mountpoint', 'Not mounted'),
+            })]
             
             # Add partition information
             partitions = disk_info.get('children', [])
             if partitions:
-                for part in partitions:
-                    detail_text += f"  {part['name']}: {part.get('size', 'Unknown')} ({part.get('fstype', 'Unknown')})\n"
+                parts.extend(
+                    f"  {part['name']}: {part.get('size', 'Unknown')} ({part.get('fstype', 'Unknown')})\n"
+                    for part in partitions
+                )
             else:
-                detail_text += "  No partitions found\n"
+                parts.append("  No partitions found\n")
             
-            detail_text += f"\n⚠️  All data on {disk['device']} will be permanently erased!"
+            parts.append(f"\n⚠️  All data on {disk['device']} will be permanently erased!")
             
-            details.update(detail_text)
+            details.update(''.join(parts))
             
         except Exception as e:
-            logger.error(f"Error updating disk details: {e}")
+            logger.error("Error updating disk details: %s", e)
     
     async def on_button_pressed(self, event: Button.Pressed) -> None:
         """Handle button presses"""
@@ -163,33 +222,22 @@ Partition Layout:
     
     async def action_refresh(self) -> None:
         """Refresh disk list"""
-        await self.refresh_disks()
-        await self.show_success("Disk list refreshed")
+        # A user refresh always rereads lsblk, and only reports when it ran
+        if await self.refresh_disks(force=True):
+            self.show_success("Disk list refreshed")
     
     async def action_continue(self) -> None:
         """Continue to next screen"""
         if not self.selected_disk:
-            await self.show_error("Please select a disk first")
+            self.show_error("Please select a disk first")
             return
         
         # Validate disk selection
         if self.selected_disk.get('mountpoint'):
-            await self.show_warning("Selected disk is currently mounted. It will be unmounted during installation.")
+            self.show_warning("Selected disk is currently mounted. It will be unmounted during installation.")
         
-        # Check disk size (minimum 20GB recommended)
-        try:
-            size_str = self.selected_disk['size']
-            # Parse size (assumes format like "500G" or "1T")
-            if 'G' in size_str:
-                size_gb = float(size_str.replace('G', ''))
-            elif 'T' in size_str:
-                size_gb = float(size_str.replace('T', '')) * 1024
-            else:
-                size_gb = 0
-            
-            if size_gb < 20:
-                await self.show_warning("Selected disk is smaller than 20GB. Installation may fail.")
-        except:
-            pass  # Skip size validation if parsing fails
+        # Check disk size, computed once when the disks were listed
+        if self.selected_disk['size_gb'] < MIN_DISK_GB:
+            self.show_warning(f"Selected disk is smaller than {MIN_DISK_GB}GB. Installation may fail.")
         
         await self.navigate_to("hostname")
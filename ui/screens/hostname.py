@@ -2,17 +2,23 @@
 Hostname configuration screen
 """
 
+import asyncio
+from typing import Optional
+
 from textual.app import ComposeResult
 from textual.containers import Container, Vertical, Horizontal
 from textual.widgets import Static, Button, Input
 from textual.binding import Binding
 
 from ui.base import BaseInstallerScreen
-from utils.validation import validate_hostname
+from utils.validation import validate_hostname, validate_hostname_fast
 from utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Seconds of typing inactivity before the hostname is validated
+VALIDATE_DEBOUNCE = 0.15
+
 class HostnameScreen(BaseInstallerScreen):
     """Hostname configuration screen"""
     
@@ -21,6 +27,10 @@ class HostnameScreen(BaseInstallerScreen):
         Binding("escape", "back", "Back"),
     ]
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._validate_timer: Optional[asyncio.Task] = None
+    
     def compose(self) -> ComposeResult:
         """Compose the hostname screen"""
         with Container(classes="container"):
@@ -48,23 +58,39 @@ class HostnameScreen(BaseInstallerScreen):
                     yield Button("Back", variant="default", id="back-btn")
                     yield Button("Continue", variant="primary", id="continue-btn")
     
+    def on_mount(self) -> None:
+        """Keep a reference to the hostname input"""
+        super().on_mount()
+        self._hostname_input = self.query_one("#hostname-input", Input)
+    
     async def on_input_changed(self, event: Input.Changed) -> None:
-        """Validate hostname as user types"""
+        """Validate hostname once the user pauses typing"""
         if event.input.id == "hostname-input":
-            hostname = event.value.strip()
-            
-            if hostname:
-                is_valid, error_msg = validate_hostname(hostname)
-                if is_valid:
-                    event.input.remove_class("error")
-                    event.input.add_class("success")
-                    self.update_config('hostname', hostname)
-                else:
-                    event.input.remove_class("success")
-                    event.input.add_class("error")
-                    event.input.tooltip = error_msg
+            # Only the last value typed within the debounce window gets validated
+            if self._validate_timer and not self._validate_timer.done():
+                self._validate_timer.cancel()
+            self._validate_timer = asyncio.create_task(
+                self._delayed_validate(event.value.strip(), event.input)
+            )
+    
+    async def _delayed_validate(self, hostname: str, hostname_input: Input) -> None:
+        """Validate the hostname after VALIDATE_DEBOUNCE seconds without typing"""
+        await asyncio.sleep(VALIDATE_DEBOUNCE)
+        if not hostname_input.is_mounted:
+            return
+        
+        if hostname:
+            if validate_hostname_fast(hostname):
+                hostname_input.remove_class("error")
+                hostname_input.add_class("success")
+                self.update_config('hostname', hostname)
             else:
-                event.input.remove_class("success", "error")
+                _, error_msg = validate_hostname(hostname)
+                hostname_input.remove_class("success")
+                hostname_input.add_class("error")
+                hostname_input.tooltip = error_msg
+        else:
+            hostname_input.remove_class("success", "error")
     
     async def on_button_pressed(self, event: Button.Pressed) -> None:
         """Handle button presses"""
@@ -79,17 +105,17 @@ class HostnameScreen(BaseInstallerScreen):
     
     async def action_continue(self) -> None:
         """Continue to next screen"""
-        hostname_input = self.query_one("#hostname-input", Input)
+        hostname_input = self._hostname_input
         hostname = hostname_input.value.strip()
         
         if not hostname:
-            await self.show_error("Please enter a hostname")
+            self.show_error("Please enter a hostname")
             hostname_input.focus()
             return
         
         is_valid, error_msg = validate_hostname(hostname)
         if not is_valid:
-            await self.show_error(f"Invalid hostname: {error_msg}")
+            self.show_error(f"Invalid hostname: {error_msg}")
             hostname_input.focus()
             return
         
@@ -5,6 +5,7 @@ Runs the actual installation process with real-time progress updates.
 """
 
 import asyncio
+import shutil
 from textual.app import ComposeResult
 from textual.containers import Container, Horizontal, Vertical, ScrollableContainer
 from textual.widgets import Header, Footer, Static, Button, ProgressBar, Log
@@ -12,9 +13,13 @@ from textual.reactive import reactive
 from textual.message import Message
 from textual import events
 
-from ui.base import BaseInstallerScreen
+from ui.base import BaseInstallerScreen, REBOOT_ON_EXIT
 from core.installer import GamerXInstaller
 
+# Lines kept in the on-screen install log; older ones are dropped, the
+# full record stays in the log file
+LOG_MAX_LINES = 2000
+
 
 class InstallScreen(BaseInstallerScreen):
     """Installation screen with progress tracking"""
@@ -86,8 +91,9 @@ class InstallScreen(BaseInstallerScreen):
     
     installation_complete = reactive(False)
     installation_error = reactive("")
-    current_step = reactive("")
-    progress_percentage = reactive(0)
+    # Drawn by their watchers; init=False as the widgets are only cached in on_mount
+    current_step = reactive("", init=False)
+    progress_percentage = reactive(0, init=False)
     
     def compose(self) -> ComposeResult:
         """Compose the installation screen"""
@@ -102,7 +108,7 @@ class InstallScreen(BaseInstallerScreen):
                 yield Static("0% Complete", id="progress_text", classes="progress-text")
             
             with Container(classes="log-container"):
-                yield Log(id="install_log", auto_scroll=True)
+                yield Log(id="install_log", auto_scroll=True, max_lines=LOG_MAX_LINES)
             
             with Horizontal(classes="button-container"):
                 yield Button("View Logs", id="logs_button", variant="default", disabled=True)
@@ -113,95 +119,138 @@ class InstallScreen(BaseInstallerScreen):
     
     def on_mount(self) -> None:
         """Start installation when screen mounts"""
+        # Progress widgets are updated on every step, look them up once
+        self._step_w = self.query_one("#step_text", Static)
+        self._progress_w = self.query_one("#main_progress", ProgressBar)
+        self._progress_text_w = self.query_one("#progress_text", Static)
+        self._log_w = self.query_one("#install_log", Log)
+        self._logs_btn = self.query_one("#logs_button", Button)
+        self._reboot_btn = self.query_one("#reboot_button", Button)
+        self._exit_btn = self.query_one("#exit_button", Button)
+        
+        # The installer only queues progress; one consumer task draws it
+        self._progress_q: asyncio.Queue = asyncio.Queue()
+        self._progress_task = asyncio.create_task(self._consume_progress())
+        
         # Start installation in background
         asyncio.create_task(self.run_installation())
     
+    def _queue_progress(self, step: str, percentage: int, message: str = "") -> None:
+        """Progress callback for the installer; never touches widgets itself"""
+        self._progress_q.put_nowait((step, percentage, message))
+    
+    async def _flush_progress(self) -> None:
+        """Draw the progress still queued and stop the consumer task"""
+        self._progress_q.put_nowait(None)
+        await self._progress_task
+    
+    async def _consume_progress(self) -> None:
+        """Draw queued progress, coalescing everything queued since the last repaint"""
+        queue = self._progress_q
+        finished = False
+        while not finished:
+            items = [await queue.get()]
+            while not queue.empty():
+                items.append(queue.get_nowait())
+            
+            # None is queued by _flush_progress as the last item
+            if items[-1] is None:
+                finished = True
+                items.pop()
+            if not items:
+                continue
+            
+            # Negative percentages are not progress: the installer sends -1 on
+            # failure and profile scripts send PROGRESS_UNCHANGED (-2) with each
+            # output line, so those are only logged, without a percentage
+            lines = []
+            latest = None
+            for step, percentage, message in items:
+                text = f"{step}: {message}" if message else step
+                if percentage < 0:
+                    lines.append(text)
+                else:
+                    lines.append(f"[{percentage}%] {text}")
+                    latest = (step, percentage)
+            
+            # Only the latest state is drawn, in one repaint with the log lines;
+            # the reactives skip their watchers when the value is unchanged
+            with self.app.batch_update():
+                if latest is not None:
+                    self.current_step, self.progress_percentage = latest
+                self._log_w.write_lines(lines)
+    
+    def watch_current_step(self, step: str) -> None:
+        """Show the current installation step"""
+        self._step_w.update(step)
+    
+    def watch_progress_percentage(self, percentage: int) -> None:
+        """Move the progress bar and its label"""
+        self._progress_w.update(progress=percentage)
+        self._progress_text_w.update(f"{percentage}% Complete")
+    
     async def run_installation(self) -> None:
         """Run the complete installation process"""
-        log_widget = self.query_one("#install_log", Log)
+        log_widget = self._log_w
         
         try:
             # Get configuration
             config = self.app.get_config()
             
-            # Initialize installer
-            installer = GamerXInstaller(config)
-            
-            # Set up progress callback
-            def progress_callback(step: str, percentage: int, message: str = ""):
-                self.current_step = step
-                self.progress_percentage = percentage
-                
-                # Update UI
-                step_widget = self.query_one("#step_text", Static)
-                progress_widget = self.query_one("#main_progress", ProgressBar)
-                progress_text = self.query_one("#progress_text", Static)
-                
-                step_widget.update(step)
-                progress_widget.update(progress=percentage)
-                progress_text.update(f"{percentage}% Complete")
-                
-                # Log the step
-                if message:
-                    log_widget.write_line(f"[{percentage}%] {step}: {message}")
-                else:
-                    log_widget.write_line(f"[{percentage}%] {step}")
+            # Initialize installer; progress only goes onto the queue
+            installer = GamerXInstaller(self._queue_progress)
             
             # Log start
-            log_widget.write_line("🚀 Starting GamerX Linux installation...")
-            log_widget.write_line(f"Target disk: {config.get('disk', {}).get('device', 'Unknown')}")
-            log_widget.write_line(f"Profile: {config.get('profile', 'Unknown')}")
-            log_widget.write_line("")
+            log_widget.write_lines([
+                "🚀 Starting GamerX Linux installation...",
+                f"Target disk: {config.disk or 'Unknown'}",
+                f"Profile: {config.profile or 'Unknown'}",
+                "",
+            ])
             
             # Run installation
-            await installer.install(progress_callback)
+            await installer.run_full_installation(config)
+            await self._flush_progress()
             
             # Installation completed successfully
             self.installation_complete = True
             
-            step_widget = self.query_one("#step_text", Static)
-            progress_widget = self.query_one("#main_progress", ProgressBar)
-            progress_text = self.query_one("#progress_text", Static)
+            self._step_w.update("✅ Installation completed successfully!")
+            self._step_w.add_class("success-text")
+            self._progress_w.update(progress=100)
+            self._progress_text_w.update("100% Complete")
             
-            step_widget.update("✅ Installation completed successfully!")
-            step_widget.add_class("success-text")
-            progress_widget.update(progress=100)
-            progress_text.update("100% Complete")
-            
-            log_widget.write_line("")
-            log_widget.write_line("🎉 Installation completed successfully!")
-            log_widget.write_line("Your GamerX Linux system is ready to use.")
-            log_widget.write_line("Please reboot to start using your new system.")
+            log_widget.write_lines([
+                "",
+                "🎉 Installation completed successfully!",
+                "Your GamerX Linux system is ready to use.",
+                "Please reboot to start using your new system.",
+            ])
             
             # Enable buttons
-            reboot_btn = self.query_one("#reboot_button", Button)
-            exit_btn = self.query_one("#exit_button", Button)
-            logs_btn = self.query_one("#logs_button", Button)
-            
-            reboot_btn.disabled = False
-            exit_btn.disabled = False
-            logs_btn.disabled = False
+            self._reboot_btn.disabled = False
+            self._exit_btn.disabled = False
+            self._logs_btn.disabled = False
             
         except Exception as e:
             # Installation failed
             self.installation_error = str(e)
+            if not self._progress_task.done():
+                await self._flush_progress()
             
-            step_widget = self.query_one("#step_text", Static)
-            progress_text = self.query_one("#progress_text", Static)
+            self._step_w.update(f"❌ Installation failed: {str(e)}")
+            self._step_w.add_class("error-text")
+            self._progress_text_w.update("Installation Failed")
             
-            step_widget.update(f"❌ Installation failed: {str(e)}")
-            step_widget.add_class("error-text")
-            progress_text.update("Installation Failed")
-            
-            log_widget.write_line("")
-            log_widget.write_line(f"❌ Installation failed: {str(e)}")
-            log_widget.write_line("Please check the logs for more details.")
+            log_widget.write_lines([
+                "",
+                f"❌ Installation failed: {str(e)}",
+                "Please check the logs for more details.",
+            ])
             
             # Enable exit button
-            exit_btn = self.query_one("#exit_button", Button)
-            logs_btn = self.query_one("#logs_button", Button)
-            exit_btn.disabled = False
-            logs_btn.disabled = False
+            self._exit_btn.disabled = False
+            self._logs_btn.disabled = False
     
     async def on_button_pressed(self, event: Button.Pressed) -> None:
         """Handle button presses"""
@@ -215,7 +264,7 @@ class InstallScreen(BaseInstallerScreen):
     async def handle_view_logs(self) -> None:
         """Handle view logs button press"""
         # You could implement a detailed log viewer here
-        await self.app.show_message("Detailed logs are displayed in the log area above", "info")
+        self.app.show_message("Detailed logs are displayed in the log area above", "info")
     
     async def handle_reboot(self) -> None:
         """Handle reboot button press"""
@@ -226,18 +275,17 @@ class InstallScreen(BaseInstallerScreen):
         )
         
         if confirm:
-            try:
-                # Run reboot command
-                import subprocess
-                subprocess.run(["reboot"], check=True)
-            except Exception as e:
-                await self.app.show_message(f"Failed to reboot: {e}", "error")
+            if shutil.which("reboot") is None:
+                self.app.show_message("Failed to reboot: reboot command not found", "error")
+                return
+            # main.py replaces the installer process with reboot after the app has exited
+            self.app.exit(REBOOT_ON_EXIT)
     
     async def handle_exit(self) -> None:
         """Handle exit button press"""
         if self.installation_complete:
             # Show reminder about rebooting
-            await self.app.show_message(
+            self.app.show_message(
                 "Installation complete! Don't forget to reboot and remove the installation media.",
                 "success"
             )
@@ -259,7 +307,7 @@ class InstallScreen(BaseInstallerScreen):
         if event.key == "ctrl+c":
             # Prevent accidental exit during installation
             if not self.installation_complete and not self.installation_error:
-                await self.app.show_message(
+                self.app.show_message(
                     "Cannot exit during installation. Please wait for completion.",
                     "warning"
                 )
@@ -5,6 +5,7 @@ Provides kernel selection with descriptions and recommendations.
 """
 
 import asyncio
+from typing import NamedTuple
 from textual.app import ComposeResult
 from textual.containers import Container, Horizontal, Vertical
 from textual.widgets import Header, Footer, Static, Button, DataTable, RadioSet, RadioButton
@@ -15,6 +16,14 @@ from textual import events
 from ui.base import BaseInstallerScreen
 
 
+class Kernel(NamedTuple):
+    """A kernel package offered on the kernel screen"""
+    name: str
+    display: str
+    description: str
+    recommended: bool
+
+
 class KernelScreen(BaseInstallerScreen):
     """Kernel selection screen with descriptions and recommendations"""
     
@@ -73,32 +82,32 @@ class KernelScreen(BaseInstallerScreen):
     """
     
     # Available kernels with descriptions
-    KERNELS = [
-        {
-            "name": "linux",
-            "display": "🐧 Linux (Stable) - Recommended",
-            "description": "The standard Arch Linux kernel. This is the most stable and well-tested kernel, receiving regular updates and security patches. Recommended for most users, especially beginners and those who prioritize stability over cutting-edge features.",
-            "recommended": True
-        },
-        {
-            "name": "linux-lts",
-            "display": "🛡️ Linux LTS (Long Term Support)",
-            "description": "Long Term Support kernel with extended maintenance period. This kernel receives security updates for a longer time but may have older features. Ideal for servers, production systems, or users who prefer maximum stability and minimal changes.",
-            "recommended": False
-        },
-        {
-            "name": "linux-zen",
-            "display": "⚡ Linux Zen (Performance)",
-            "description": "Performance-optimized kernel with additional patches for better desktop responsiveness and gaming performance. Includes optimizations for CPU scheduling, memory management, and I/O performance. Great for gaming, multimedia work, and power users.",
-            "recommended": False
-        },
-        {
-            "name": "linux-hardened",
-            "display": "🔒 Linux Hardened (Security)",
-            "description": "Security-focused kernel with additional hardening patches and security features. Includes enhanced protection against various attack vectors but may have slightly reduced performance. Recommended for security-conscious users and sensitive environments.",
-            "recommended": False
-        }
-    ]
+    KERNELS = (
+        Kernel(
+            name="linux",
+            display="🐧 Linux (Stable) - Recommended",
+            description="The standard Arch Linux kernel. This is the most stable and well-tested kernel, receiving regular updates and security patches. Recommended for most users, especially beginners and those who prioritize stability over cutting-edge features.",
+            recommended=True,
+        ),
+        Kernel(
+            name="linux-lts",
+            display="🛡️ Linux LTS (Long Term Support)",
+            description="Long Term Support kernel with extended maintenance period. This kernel receives security updates for a longer time but may have older features. Ideal for servers, production systems, or users who prefer maximum stability and minimal changes.",
+            recommended=False,
+        ),
+        Kernel(
+            name="linux-zen",
+            display="⚡ Linux Zen (Performance)",
+            description="Performance-optimized kernel with additional patches for better desktop responsiveness and gaming performance. Includes optimizations for CPU scheduling, memory management, and I/O performance. Great for gaming, multimedia work, and power users.",
+            recommended=False,
+        ),
+        Kernel(
+            name="linux-hardened",
+            display="🔒 Linux Hardened (Security)",
+            description="Security-focused kernel with additional hardening patches and security features. Includes enhanced protection against various attack vectors but may have slightly reduced performance. Recommended for security-conscious users and sensitive environments.",
+            recommended=False,
+        ),
+    )
     
     selected_kernel = reactive("linux")  # Default to stable kernel
     
@@ -113,9 +122,9 @@ class KernelScreen(BaseInstallerScreen):
             with RadioSet(id="kernel_options", classes="kernel-options"):
                 for kernel in self.KERNELS:
                     yield RadioButton(
-                        kernel["display"],
-                        value=kernel["name"] == self.selected_kernel,
-                        id=f"kernel_{kernel['name']}"
+                        kernel.display,
+                        value=kernel.name == self.selected_kernel,
+                        id=f"kernel_{kernel.name}"
                     )
             
             with Container(classes="kernel-description"):
@@ -129,8 +138,15 @@ class KernelScreen(BaseInstallerScreen):
     
     def on_mount(self) -> None:
         """Initialize the kernel selection when screen mounts"""
+        # Radio buttons and the description by kernel name, looked up once
+        self._radio_by_name = {
+            kernel.name: self.query_one(f"#kernel_{kernel.name}", RadioButton)
+            for kernel in self.KERNELS
+        }
+        self._description_w = self.query_one("#description_text", Static)
         self.restore_previous_selection()
         self.update_description()
+        self.prefetch_screen("ui.screens.swap")
     
     def restore_previous_selection(self) -> None:
         """Restore previously selected kernel"""
@@ -139,36 +155,25 @@ class KernelScreen(BaseInstallerScreen):
             self.selected_kernel = config["kernel"]
         
         # Update radio buttons
-        radio_set = self.query_one("#kernel_options", RadioSet)
-        for kernel in self.KERNELS:
-            radio_button = self.query_one(f"#kernel_{kernel['name']}", RadioButton)
-            radio_button.value = (kernel["name"] == self.selected_kernel)
+        for name, radio_button in self._radio_by_name.items():
+            radio_button.value = (name == self.selected_kernel)
     
     def update_description(self) -> None:
         """Update the kernel description based on selection"""
-        description_widget = self.query_one("#description_text", Static)
-        
-        # Find the selected kernel
-        selected_kernel_info = next(
-            (k for k in self.KERNELS if k["name"] == self.selected_kernel),
-            self.KERNELS[0]  # Default to first kernel
-        )
+        # Markup is prebuilt per kernel; unknown names fall back to the first kernel
+        description = _KERNEL_DESC_MARKUP.get(self.selected_kernel)
+        if description is None:
+            description = _KERNEL_DESC_MARKUP[self.KERNELS[0].name]
         
-        # Update description text
-        description = selected_kernel_info["description"]
-        if selected_kernel_info["recommended"]:
-            description = f"[bold green]RECOMMENDED[/bold green]\n\n{description}"
-        
-        description_widget.update(description)
+        self._description_w.update(description)
     
     async def on_radio_set_changed(self, event: RadioSet.Changed) -> None:
         """Handle kernel selection change"""
         if event.radio_set.id == "kernel_options":
             # Find which radio button is selected
-            for kernel in self.KERNELS:
-                radio_button = self.query_one(f"#kernel_{kernel['name']}", RadioButton)
+            for name, radio_button in self._radio_by_name.items():
                 if radio_button.value:
-                    self.selected_kernel = kernel["name"]
+                    self.selected_kernel = name
                     self.update_description()
                     break
     
@@ -186,7 +191,7 @@ class KernelScreen(BaseInstallerScreen):
     async def handle_continue(self) -> None:
         """Handle continue button press"""
         if not self.selected_kernel:
-            await self.app.show_message("Please select a kernel", "error")
+            self.app.show_message("Please select a kernel", "error")
             return
         
         # Update configuration
@@ -194,12 +199,10 @@ class KernelScreen(BaseInstallerScreen):
         config["kernel"] = self.selected_kernel
         
         # Find the display name for the selected kernel
-        display_name = next(
-            (k["display"] for k in self.KERNELS if k["name"] == self.selected_kernel),
-            self.selected_kernel
-        )
+        kernel = _KERNEL_BY_NAME.get(self.selected_kernel)
+        display_name = kernel.display if kernel else self.selected_kernel
         
-        await self.app.show_message(f"Kernel set to: {display_name}", "success")
+        self.app.show_message(f"Kernel set to: {display_name}", "success")
         
         # Navigate to next screen (swap)
         from ui.screens.swap import SwapScreen
@@ -216,15 +219,27 @@ class KernelScreen(BaseInstallerScreen):
             try:
                 index = int(event.key) - 1
                 if 0 <= index < len(self.KERNELS):
-                    kernel = self.KERNELS[index]
-                    self.selected_kernel = kernel["name"]
+                    previous = self._radio_by_name.get(self.selected_kernel)
+                    self.selected_kernel = self.KERNELS[index].name
                     
-                    # Update radio buttons
-                    radio_set = self.query_one("#kernel_options", RadioSet)
-                    for i, k in enumerate(self.KERNELS):
-                        radio_button = self.query_one(f"#kernel_{k['name']}", RadioButton)
-                        radio_button.value = (i == index)
+                    # Only the previously and newly selected buttons change
+                    if previous is not None:
+                        previous.value = False
+                    self._radio_by_name[self.selected_kernel].value = True
                     
                     self.update_description()
             except (ValueError, IndexError):
                 pass
+
+
+# KERNELS indexed by package name, built once at import
+_KERNEL_BY_NAME = {kernel.name: kernel for kernel in KernelScreen.KERNELS}
+
+# Description markup shown for each kernel, with the recommended banner baked in
+_KERNEL_DESC_MARKUP = {
+    kernel.name: (
+        f"[bold green]RECOMMENDED[/bold green]\n\n{kernel.description}"
+        if kernel.recommended else kernel.description
+    )
+    for kernel in KernelScreen.KERNELS
+}
@@ -12,9 +12,21 @@ from textual.widgets import Header, Footer, Static, Button, DataTable, Input
 from textual.reactive import reactive
 from textual.message import Message
 from textual import events
+from textual.timer import Timer
+from typing import NamedTuple, Optional, Set
 
 from ui.base import BaseInstallerScreen
 
+# Seconds of no typing before the locale table is filtered
+SEARCH_DEBOUNCE = 0.08
+
+
+class Locale(NamedTuple):
+    """A locale offered on the locale screen"""
+    flag: str
+    name: str
+    code: str
+
 
 class LocaleScreen(BaseInstallerScreen):
     """Locale selection screen with user-friendly display"""
@@ -62,47 +74,54 @@ class LocaleScreen(BaseInstallerScreen):
     """
     
     # Common locales with user-friendly display
-    LOCALES = [
-        ("🇺🇸", "English (United States)", "en_US.UTF-8"),
-        ("🇬🇧", "English (United Kingdom)", "en_GB.UTF-8"),
-        ("🇨🇦", "English (Canada)", "en_CA.UTF-8"),
-        ("🇦🇺", "English (Australia)", "en_AU.UTF-8"),
-        ("🇫🇷", "French (France)", "fr_FR.UTF-8"),
-        ("🇨🇦", "French (Canada)", "fr_CA.UTF-8"),
-        ("🇩🇪", "German (Germany)", "de_DE.UTF-8"),
-        ("🇦🇹", "German (Austria)", "de_AT.UTF-8"),
-        ("🇨🇭", "German (Switzerland)", "de_CH.UTF-8"),
-        ("🇪🇸", "Spanish (Spain)", "es_ES.UTF-8"),
-        ("🇲🇽", "Spanish (Mexico)", "es_MX.UTF-8"),
-        ("🇦🇷", "Spanish (Argentina)", "es_AR.UTF-8"),
-        ("🇮🇹", "Italian (Italy)", "it_IT.UTF-8"),
-        ("🇵🇹", "Portuguese (Portugal)", "pt_PT.UTF-8"),
-        ("🇧🇷", "Portuguese (Brazil)", "pt_BR.UTF-8"),
-        ("🇷🇺", "Russian (Russia)", "ru_RU.UTF-8"),
-        ("🇯🇵", "Japanese (Japan)", "ja_JP.UTF-8"),
-        ("🇰🇷", "Korean (South Korea)", "ko_KR.UTF-8"),
-        ("🇨🇳", "Chinese Simplified (China)", "zh_CN.UTF-8"),
-        ("🇹🇼", "Chinese Traditional (Taiwan)", "zh_TW.UTF-8"),
-        ("🇳🇱", "Dutch (Netherlands)", "nl_NL.UTF-8"),
-        ("🇧🇪", "Dutch (Belgium)", "nl_BE.UTF-8"),
-        ("🇸🇪", "Swedish (Sweden)", "sv_SE.UTF-8"),
-        ("🇳🇴", "Norwegian (Norway)", "nb_NO.UTF-8"),
-        ("🇩🇰", "Danish (Denmark)", "da_DK.UTF-8"),
-        ("🇫🇮", "Finnish (Finland)", "fi_FI.UTF-8"),
-        ("🇵🇱", "Polish (Poland)", "pl_PL.UTF-8"),
-        ("🇨🇿", "Czech (Czech Republic)", "cs_CZ.UTF-8"),
-        ("🇭🇺", "Hungarian (Hungary)", "hu_HU.UTF-8"),
-        ("🇬🇷", "Greek (Greece)", "el_GR.UTF-8"),
-        ("🇹🇷", "Turkish (Turkey)", "tr_TR.UTF-8"),
-        ("🇮🇳", "Hindi (India)", "hi_IN.UTF-8"),
-        ("🇮🇳", "English (India)", "en_IN.UTF-8"),
-        ("🇹🇭", "Thai (Thailand)", "th_TH.UTF-8"),
-        ("🇻🇳", "Vietnamese (Vietnam)", "vi_VN.UTF-8"),
-    ]
+    LOCALES = (
+        Locale("🇺🇸", "English (United States)", "en_US.UTF-8"),
+        Locale("🇬🇧", "English (United Kingdom)", "en_GB.UTF-8"),
+        Locale("🇨🇦", "English (Canada)", "en_CA.UTF-8"),
+        Locale("🇦🇺", "English (Australia)", "en_AU.UTF-8"),
+        Locale("🇫🇷", "French (France)", "fr_FR.UTF-8"),
+        Locale("🇨🇦", "French (Canada)", "fr_CA.UTF-8"),
+        Locale("🇩🇪", "German (Germany)", "de_DE.UTF-8"),
+        Locale("🇦🇹", "German (Austria)", "de_AT.UTF-8"),
+        Locale("🇨🇭", "German (Switzerland)", "de_CH.UTF-8"),
+        Locale("🇪🇸", "Spanish (Spain)", "es_ES.UTF-8"),
+        Locale("🇲🇽", "Spanish (Mexico)", "es_MX.UTF-8"),
+        Locale("🇦🇷", "Spanish (Argentina)", "es_AR.UTF-8"),
+        Locale("🇮🇹", "Italian (Italy)", "it_IT.UTF-8"),
+        Locale("🇵🇹", "Portuguese (Portugal)", "pt_PT.UTF-8"),
+        Locale("🇧🇷", "Portuguese (Brazil)", "pt_BR.UTF-8"),
+        Locale("🇷🇺", "Russian (Russia)", "ru_RU.UTF-8"),
+        Locale("🇯🇵", "Japanese (Japan)", "ja_JP.UTF-8"),
+        Locale("🇰🇷", "Korean (South Korea)", "ko_KR.UTF-8"),
+        Locale("🇨🇳", "Chinese Simplified (China)", "zh_CN.UTF-8"),
+        Locale("🇹🇼", "Chinese Traditional (Taiwan)", "zh_TW.UTF-8"),
+        Locale("🇳🇱", "Dutch (Netherlands)", "nl_NL.UTF-8"),
+        Locale("🇧🇪", "Dutch (Belgium)", "nl_BE.UTF-8"),
+        Locale("🇸🇪", "Swedish (Sweden)", "sv_SE.UTF-8"),
+        Locale("🇳🇴", "Norwegian (Norway)", "nb_NO.UTF-8"),
+        Locale("🇩🇰", "Danish (Denmark)", "da_DK.UTF-8"),
+        Locale("🇫🇮", "Finnish (Finland)", "fi_FI.UTF-8"),
+        Locale("🇵🇱", "Polish (Poland)", "pl_PL.UTF-8"),
+        Locale("🇨🇿", "Czech (Czech Republic)", "cs_CZ.UTF-8"),
+        Locale("🇭🇺", "Hungarian (Hungary)", "hu_HU.UTF-8"),
+        Locale("🇬🇷", "Greek (Greece)", "el_GR.UTF-8"),
+        Locale("🇹🇷", "Turkish (Turkey)", "tr_TR.UTF-8"),
+        Locale("🇮🇳", "Hindi (India)", "hi_IN.UTF-8"),
+        Locale("🇮🇳", "English (India)", "en_IN.UTF-8"),
+        Locale("🇹🇭", "Thai (Thailand)", "th_TH.UTF-8"),
+        Locale("🇻🇳", "Vietnamese (Vietnam)", "vi_VN.UTF-8"),
+    )
     
     selected_locale = reactive("")
     search_query = reactive("")
     
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pending_query = ""
+        self._debounce_timer: Optional[Timer] = None
+        # Locale codes currently shown in the table
+        self._visible_keys: Set[str] = set()
+    
     def compose(self) -> ComposeResult:
         """Compose the locale selection screen"""
         yield Header()
@@ -129,6 +148,7 @@ class LocaleScreen(BaseInstallerScreen):
         """Initialize the locale table when screen mounts"""
         self.setup_locale_table()
         self.restore_previous_selection()
+        self.prefetch_screen("ui.screens.timezone")
     
     def setup_locale_table(self) -> None:
         """Setup the locale selection table"""
@@ -139,6 +159,7 @@ class LocaleScreen(BaseInstallerScreen):
         # Add all locales to table
         for flag, name, code in self.LOCALES:
             table.add_row(flag, name, code, key=code)
+        self._visible_keys = {code for flag, name, code in self.LOCALES}
     
     def restore_previous_selection(self) -> None:
         """Restore previously selected locale"""
@@ -157,16 +178,24 @@ class LocaleScreen(BaseInstallerScreen):
     def filter_locales(self, query: str) -> None:
         """Filter locales based on search query"""
         table = self.query_one("#locale_table", DataTable)
-        table.clear()
         
         query_lower = query.lower()
         filtered_locales = [
-            (flag, name, code) for flag, name, code in self.LOCALES
-            if query_lower in name.lower() or query_lower in code.lower()
+            (flag, name, code) for haystack, flag, name, code in _LOCALE_SEARCH
+            if query_lower in haystack
         ]
+        new_keys = {code for flag, name, code in filtered_locales}
         
-        for flag, name, code in filtered_locales:
-            table.add_row(flag, name, code, key=code)
+        if new_keys <= self._visible_keys:
+            # Narrowing the search only drops rows, the rest stay in place
+            for code in self._visible_keys - new_keys:
+                table.remove_row(code)
+        else:
+            # Rows coming back would be appended out of LOCALES order, so rebuild
+            table.clear()
+            for flag, name, code in filtered_locales:
+                table.add_row(flag, name, code, key=code)
+        self._visible_keys = new_keys
         
         # Restore selection if it's still visible
         if self.selected_locale:
@@ -179,7 +208,16 @@ class LocaleScreen(BaseInstallerScreen):
         """Handle search input changes"""
         if event.input.id == "locale_search":
             self.search_query = event.value
-            self.filter_locales(event.value)
+            # Restart the timer so a burst of keystrokes filters the table once
+            self._pending_query = event.value
+            if self._debounce_timer is not None:
+                self._debounce_timer.stop()
+            self._debounce_timer = self.set_timer(SEARCH_DEBOUNCE, self._apply_filter)
+    
+    def _apply_filter(self) -> None:
+        """Filter the table by the latest search query"""
+        self._debounce_timer = None
+        self.filter_locales(self._pending_query)
     
     async def on_data_table_row_selected(self, event: DataTable.RowSelected) -> None:
         """Handle locale selection"""
@@ -206,7 +244,7 @@ class LocaleScreen(BaseInstallerScreen):
     async def handle_continue(self) -> None:
         """Handle continue button press"""
         if not self.selected_locale:
-            await self.app.show_message("Please select a locale", "error")
+            self.app.show_message("Please select a locale", "error")
             return
         
         # Update configuration
@@ -214,12 +252,9 @@ class LocaleScreen(BaseInstallerScreen):
         config["locale"] = self.selected_locale
         
         # Find the display name for the selected locale
-        display_name = next(
-            (name for flag, name, code in self.LOCALES if code == self.selected_locale),
-            self.selected_locale
-        )
+        display_name = _LOCALE_NAME_BY_CODE.get(self.selected_locale, self.selected_locale)
         
-        await self.app.show_message(f"Locale set to: {display_name}", "success")
+        self.app.show_message(f"Locale set to: {display_name}", "success")
         
         # Navigate to next screen (timezone)
         from ui.screens.timezone import TimezoneScreen
@@ -236,3 +271,12 @@ class LocaleScreen(BaseInstallerScreen):
             # Focus search input
             search_input = self.query_one("#locale_search", Input)
             search_input.focus()
+
+
+# LOCALES lookups built once at import: display name by code, and the
+# rows keyed by one lowercased search string. The NUL separator keeps a
+# query from matching across the end of the name and the start of the code
+_LOCALE_NAME_BY_CODE = {code: name for flag, name, code in LocaleScreen.LOCALES}
+_LOCALE_SEARCH = [
+    (f"{name.lower()}\x00{code.lower()}", flag, name, code) for flag, name, code in LocaleScreen.LOCALES
+]
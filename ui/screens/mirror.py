@@ -267,7 +267,7 @@ class MirrorScreen(BaseInstallerScreen):
     async def handle_continue(self) -> None:
         """Handle continue button press"""
         if not self.selected_mirror:
-            await self.app.show_message("Please select a mirror", "error")
+            self.app.show_message("Please select a mirror", "error")
             return
         
         # Update configuration
@@ -286,7 +286,7 @@ class MirrorScreen(BaseInstallerScreen):
             if isinstance(speed, (int, float)) and speed != float('inf'):
                 speed_info = f" ({speed:.0f}ms)"
         
-        await self.app.show_message(f"Mirror set to: {display_name}{speed_info}", "success")
+        self.app.show_message(f"Mirror set to: {display_name}{speed_info}", "success")
         
         # Navigate to next screen (packages)
         from ui.screens.packages import PackagesScreen
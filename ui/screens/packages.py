@@ -249,7 +249,7 @@ class PackagesScreen(BaseInstallerScreen):
         config = self.app.get_config()
         config["additional_packages"] = []
         
-        await self.app.show_message("No additional packages will be installed", "info")
+        self.app.show_message("No additional packages will be installed", "info")
         
         # Navigate to next screen (profiles)
         from ui.screens.profiles import ProfilesScreen
@@ -262,7 +262,7 @@ class PackagesScreen(BaseInstallerScreen):
         
         # Check for invalid packages
         if "❌" in validation_msg:
-            await self.app.show_message("Please fix invalid package names before continuing", "error")
+            self.app.show_message("Please fix invalid package names before continuing", "error")
             return
         
         # Update configuration
@@ -275,9 +275,9 @@ class PackagesScreen(BaseInstallerScreen):
             sample = ", ".join(valid_packages[:3])
             if count > 3:
                 sample += f" (and {count - 3} more)"
-            await self.app.show_message(f"Will install {count} additional packages: {sample}", "success")
+            self.app.show_message(f"Will install {count} additional packages: {sample}", "success")
         else:
-            await self.app.show_message("No additional packages selected", "info")
+            self.app.show_message("No additional packages selected", "info")
         
         # Navigate to next screen (profiles)
         from ui.screens.profiles import ProfilesScreen
@@ -294,4 +294,4 @@ class PackagesScreen(BaseInstallerScreen):
             help_text = "Common packages:\n\n"
             for category, packages in list(self.PACKAGE_SUGGESTIONS.items())[:3]:
                 help_text += f"{category}: {', '.join(packages[:5])}\n"
-            await self.app.show_message(help_text, "info")
+            self.app.show_message(help_text, "info")
@@ -252,7 +252,7 @@ class ProfilesScreen(BaseInstallerScreen):
     
     async def handle_refresh(self) -> None:
         """Handle refresh button press"""
-        await self.app.show_message("Refreshing profiles...", "info")
+        self.app.show_message("Refreshing profiles...", "info")
         
         # Reload profiles
         self.load_profiles()
@@ -267,18 +267,18 @@ class ProfilesScreen(BaseInstallerScreen):
                 info_widget = self.query_one("#profile_info", Static)
                 info_widget.update("Select a profile to view details")
         
-        await self.app.show_message("Profiles refreshed", "success")
+        self.app.show_message("Profiles refreshed", "success")
     
     async def handle_continue(self) -> None:
         """Handle continue button press"""
         if not self.selected_profile:
-            await self.app.show_message("Please select a profile", "error")
+            self.app.show_message("Please select a profile", "error")
             return
         
         # Final validation
         is_valid, validation_msg = self.profile_manager.validate_profile(self.selected_profile)
         if not is_valid:
-            await self.app.show_message(f"Profile validation failed: {validation_msg}", "error")
+            self.app.show_message(f"Profile validation failed: {validation_msg}", "error")
             return
         
         # Check system requirements if available
@@ -298,7 +298,7 @@ class ProfilesScreen(BaseInstallerScreen):
                     required_ram = req["ram"]
                     
                     if system_ram_gb < required_ram:
-                        await self.app.show_message(
+                        self.app.show_message(
                             f"Warning: Profile requires {required_ram}GB RAM, system has {system_ram_gb:.1f}GB",
                             "warning"
                         )
@@ -309,7 +309,7 @@ class ProfilesScreen(BaseInstallerScreen):
         config = self.app.get_config()
         config["profile"] = self.selected_profile
         
-        await self.app.show_message(f"Profile set to: {self.selected_profile}", "success")
+        self.app.show_message(f"Profile set to: {self.selected_profile}", "success")
         
         # Navigate to next screen (summary)
         from ui.screens.summary import SummaryScreen
@@ -237,9 +237,14 @@ class SummaryScreen(BaseInstallerScreen):
         if event.checkbox.id == "confirm_checkbox":
             self.confirmed = event.value
             
-            # Update install button state
+            # Update install button state; the quick check is enough here and
+            # the full error list is only built when it fails
             install_btn = self.query_one("#install_button", Button)
-            install_btn.disabled = not self.confirmed
+            config_valid = self.app.is_config_valid()
+            install_btn.disabled = not (self.confirmed and config_valid)
+            if self.confirmed and not config_valid:
+                _, errors = self.app.validate_config()
+                self.app.show_message(f"Invalid configuration: {'; '.join(errors)}", "error")
     
     async def on_button_pressed(self, event: Button.Pressed) -> None:
         """Handle button presses"""
@@ -261,28 +266,25 @@ class SummaryScreen(BaseInstallerScreen):
             
             # Save to file (you could implement config file saving here)
             # For now, just show a message
-            await self.app.show_message("Configuration saved successfully", "success")
+            self.app.show_message("Configuration saved successfully", "success")
             
         except Exception as e:
-            await self.app.show_message(f"Failed to save configuration: {e}", "error")
+            self.app.show_message(f"Failed to save configuration: {e}", "error")
     
     async def handle_install(self) -> None:
         """Handle install button press"""
         if not self.confirmed:
-            await self.app.show_message("Please confirm that you want to proceed", "error")
+            self.app.show_message("Please confirm that you want to proceed", "error")
             return
         
-        # Final validation
-        config = self.app.get_config()
-        required_fields = ["disk", "hostname", "username", "locale", "timezone", "kernel", "profile"]
-        
-        missing_fields = [field for field in required_fields if field not in config]
-        if missing_fields:
-            await self.app.show_message(f"Missing configuration: {', '.join(missing_fields)}", "error")
+        # Final validation, with every problem listed
+        is_valid, errors = self.app.validate_config()
+        if not is_valid:
+            self.app.show_message(f"Invalid configuration: {'; '.join(errors)}", "error")
             return
         
         # Show final confirmation
-        await self.app.show_message("Starting installation... This cannot be undone!", "warning")
+        self.app.show_message("Starting installation... This cannot be undone!", "warning")
         
         # Navigate to installation screen
         from ui.screens.install import InstallScreen
@@ -289,7 +289,7 @@ class SwapScreen(BaseInstallerScreen):
         # Check if fixed size is too large
         if isinstance(swap_size, int) and swap_size > 0:
             if swap_size > self.available_space_gb * 0.8:
-                await self.app.show_message(
+                self.app.show_message(
                     f"Not enough disk space for {swap_size} GB swap. Please select a smaller size.",
                     "error"
                 )
@@ -308,7 +308,7 @@ class SwapScreen(BaseInstallerScreen):
         else:
             message = f"Swap set to {swap_size} GB"
         
-        await self.app.show_message(message, "success")
+        self.app.show_message(message, "success")
         
         # Navigate to next screen (mirror)
         from ui.screens.mirror import MirrorScreen
@@ -233,7 +233,7 @@ class TimezoneScreen(BaseInstallerScreen):
     async def handle_continue(self) -> None:
         """Handle continue button press"""
         if not self.selected_timezone:
-            await self.app.show_message("Please select a timezone", "error")
+            self.app.show_message("Please select a timezone", "error")
             return
         
         # Update configuration
@@ -246,7 +246,7 @@ class TimezoneScreen(BaseInstallerScreen):
             self.selected_timezone
         )
         
-        await self.app.show_message(f"Timezone set to: {display_name}", "success")
+        self.app.show_message(f"Timezone set to: {display_name}", "success")
         
         # Navigate to next screen (kernel)
         from ui.screens.kernel import KernelScreen
@@ -147,31 +147,31 @@ class UserScreen(BaseInstallerScreen):
         
         # Validate username
         if not username:
-            await self.show_error("Please enter a username")
+            self.show_error("Please enter a username")
             username_input.focus()
             return
         
         is_valid, error_msg = validate_username(username)
         if not is_valid:
-            await self.show_error(f"Invalid username: {error_msg}")
+            self.show_error(f"Invalid username: {error_msg}")
             username_input.focus()
             return
         
         # Validate password
         if not password:
-            await self.show_error("Please enter a password")
+            self.show_error("Please enter a password")
             password_input.focus()
             return
         
         is_valid, error_msg = validate_password(password)
         if not is_valid:
-            await self.show_error(f"Invalid password: {error_msg}")
+            self.show_error(f"Invalid password: {error_msg}")
             password_input.focus()
             return
         
         # Validate password confirmation
         if password != confirm_password:
-            await self.show_error("Passwords do not match")
+            self.show_error("Passwords do not match")
             confirm_password_input.focus()
             return
         
@@ -80,7 +80,7 @@ class WelcomeScreen(BaseInstallerScreen):
                         status.update(f"❌ {description} - FAILED")
                         await asyncio.sleep(1)
                 except Exception as e:
-                    logger.error(f"Check failed: {description} - {e}")
+                    logger.error("Check failed: %s - %s", description, e)
                     status.update(f"❌ {description} - ERROR: {e}")
                     await asyncio.sleep(1)
             
@@ -89,14 +89,14 @@ class WelcomeScreen(BaseInstallerScreen):
             if passed_checks == total_checks:
                 status.update("✅ All system checks passed! Ready to install.")
                 self.query_one("#continue-btn", Button).disabled = False
-                await self.show_success("System checks completed successfully")
+                self.show_success("System checks completed successfully")
             else:
                 status.update(f"❌ {passed_checks}/{total_checks} checks passed. Cannot continue.")
-                await self.show_error(f"System checks failed. {passed_checks}/{total_checks} passed.")
+                self.show_error(f"System checks failed. {passed_checks}/{total_checks} passed.")
                 
         except Exception as e:
-            logger.error(f"System checks failed: {e}")
-            await self.show_error(f"System checks failed: {e}")
+            logger.error("System checks failed: %s", e)
+            self.show_error(f"System checks failed: {e}")
     
     def check_root(self) -> bool:
         """Check if running as root"""
@@ -146,7 +146,7 @@ class WelcomeScreen(BaseInstallerScreen):
                     text=True
                 )
                 if result.returncode != 0:
-                    logger.error(f"Required tool not found: {tool}")
+                    logger.error("Required tool not found: %s", tool)
                     return False
             
             return True
@@ -2,6 +2,7 @@
 Centralized logging system for GamerX Installer
 """
 
+import contextvars
 import logging
 import sys
 from pathlib import Path
@@ -26,6 +27,16 @@ class ColoredFormatter(logging.Formatter):
             record.levelname = f"{self.COLORS[record.levelname]}{record.levelname}{self.RESET}"
         return super().format(record)
 
+# Profile currently being installed; tagged onto every log record from that task
+current_profile = contextvars.ContextVar("profile", default="-")
+
+class ProfileContextFilter(logging.Filter):
+    """Attach the current profile to log records"""
+    
+    def filter(self, record):
+        record.profile = current_profile.get()
+        return True
+
 def setup_logging(level=logging.INFO):
     """Setup logging configuration"""
     
@@ -56,15 +67,16 @@ def setup_logging(level=logging.INFO):
     # File handler for detailed logs
     file_handler = logging.FileHandler(log_file)
     file_handler.setLevel(logging.DEBUG)
+    file_handler.addFilter(ProfileContextFilter())
     file_formatter = logging.Formatter(
-        '%(asctime)s | %(levelname)s | %(name)s | %(funcName)s:%(lineno)d | %(message)s'
+        '%(asctime)s | %(levelname)s | %(name)s | %(profile)s | %(funcName)s:%(lineno)d | %(message)s'
     )
     file_handler.setFormatter(file_formatter)
     root_logger.addHandler(file_handler)
     
     # Log startup info
     logger = logging.getLogger(__name__)
-    logger.info(f"Logging initialized - Log file: {log_file}")
+    logger.info("Logging initialized - Log file: %s", log_file)
     
     return log_file
 
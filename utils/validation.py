@@ -4,6 +4,7 @@ Input validation utilities
 
 import re
 import shutil
+import functools
 import subprocess
 import socket
 from pathlib import Path
@@ -17,6 +18,12 @@ class ValidationError(Exception):
     """Custom validation error"""
     pass
 
+# Hostname rules in one pattern, shared with the installer's config check
+_HOSTNAME_RE = VALIDATION["hostname"]
+
+# Bare match for per-keystroke checks; validate_hostname explains failures
+validate_hostname_fast = _HOSTNAME_RE.match
+
 def validate_hostname(hostname: str) -> Tuple[bool, str]:
     """Validate hostname according to RFC standards"""
     if not hostname:
@@ -25,13 +32,20 @@ def validate_hostname(hostname: str) -> Tuple[bool, str]:
     if len(hostname) > 63:
         return False, "Hostname too long (max 63 characters)"
     
-    if not re.match(VALIDATION["hostname"], hostname):
-        return False, "Invalid hostname format (use letters, numbers, hyphens only)"
+    if _HOSTNAME_RE.match(hostname):
+        return True, "Valid hostname"
+    
+    # Find which rule failed, for the message
+    if len(hostname) < 2:
+        return False, "Hostname too short (min 2 characters)"
     
     if hostname.startswith('-') or hostname.endswith('-'):
         return False, "Hostname cannot start or end with hyphen"
     
-    return True, "Valid hostname"
+    if '--' in hostname:
+        return False, "Hostname cannot contain consecutive hyphens"
+    
+    return False, "Invalid hostname format (use letters, numbers, hyphens only)"
 
 def validate_username(username: str) -> Tuple[bool, str]:
     """Validate username according to Linux standards"""
@@ -41,7 +55,7 @@ def validate_username(username: str) -> Tuple[bool, str]:
     if len(username) > 32:
         return False, "Username too long (max 32 characters)"
     
-    if not re.match(VALIDATION["username"], username):
+    if not VALIDATION["username"].match(username):
         return False, "Invalid username (use lowercase letters, numbers, underscore, hyphen only)"
     
     if username in ['root', 'bin', 'daemon', 'sys', 'sync', 'games', 'man', 'lp', 'mail', 'news', 'uucp', 'proxy', 'www-data', 'backup', 'list', 'irc', 'gnats', 'nobody']:
@@ -82,7 +96,7 @@ def validate_package_list(packages: str) -> Tuple[bool, str, list]:
             continue
             
         # Basic package name validation
-        if not re.match(VALIDATION["package_name"], pkg):
+        if not VALIDATION["package_name"].match(pkg):
             return False, f"Invalid package name: {pkg}", []
         
         package_list.append(pkg)
@@ -121,12 +135,7 @@ def validate_swap_size(swap_size: str, disk_path: str) -> Tuple[bool, str]:
     
     try:
         # Get available RAM
-        with open('/proc/meminfo', 'r') as f:
-            for line in f:
-                if line.startswith('MemTotal:'):
-                    ram_kb = int(line.split()[1])
-                    ram_gb = ram_kb // (1024 * 1024)
-                    break
+        ram_gb = get_total_ram_gb()
         
         if swap_size == "auto":
             # Auto swap = RAM size, max 8GB
@@ -159,6 +168,15 @@ def validate_swap_size(swap_size: str, disk_path: str) -> Tuple[bool, str]:
         logger.error(f"Error validating swap size: {e}")
         return False, f"Could not validate swap size: {e}"
 
+@functools.lru_cache(maxsize=1)
+def get_total_ram_gb() -> int:
+    """Get total system RAM in GB, read once since it cannot change at runtime"""
+    meminfo = Path('/proc/meminfo').read_text()
+    match = re.search(r'MemTotal:\s+(\d+)', meminfo)
+    if not match:
+        raise ValueError("MemTotal not found in /proc/meminfo")
+    return int(match.group(1)) // (1024 * 1024)
+
 def get_system_memory() -> int:
     """Get system memory in MB"""
     try: